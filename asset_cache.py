@@ -0,0 +1,52 @@
+import pygame
+import threading
+from collections import OrderedDict
+
+# Maximum number of converted surfaces kept alive at once
+MAX_CACHED_IMAGES = 128
+
+
+class AssetCache:
+    """Process-wide image cache so every file is decoded and converted only once.
+
+    Rooms are built on a background thread, so lookups are serialised with a lock.
+    """
+
+    def __init__(self, max_size=MAX_CACHED_IMAGES):
+        self.max_size = max_size
+        self.images = OrderedDict()
+        self.lock = threading.RLock()
+
+    def get_image(self, path, size=None, flip=(False, False)):
+        """Return the image at path, optionally scaled to size and flipped (flip_x, flip_y)."""
+        key = (path, size, flip)
+        with self.lock:
+            image = self.images.get(key)
+            if image is not None:
+                self.images.move_to_end(key)
+                return image
+
+            # Build derived surfaces from cached ones so the file is only read once
+            if flip != (False, False):
+                image = pygame.transform.flip(self.get_image(path, size), *flip)
+            elif size is not None:
+                image = pygame.transform.scale(self.get_image(path), size)
+            else:
+                image = pygame.image.load(path).convert_alpha()
+
+            self.images[key] = image
+            while len(self.images) > self.max_size:
+                self.images.popitem(last=False)
+            return image
+
+    def clear(self):
+        with self.lock:
+            self.images.clear()
+
+
+# Shared instance used by the game objects
+asset_cache = AssetCache()
+
+
+def load_image(path, size=None, flip=(False, False)):
+    return asset_cache.get_image(path, size, flip)
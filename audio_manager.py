@@ -1,36 +1,233 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
 import pygame
 
+# Mixer channels: MUSIC_CHANNELS for music, then RESERVED_CHANNELS that only play sounds
+# loaded with reserved=True, and the rest shared by every other sound
+MIXER_CHANNELS = 16
+MUSIC_CHANNELS = 2  # Two so one track can fade out while the next fades in
+RESERVED_CHANNELS = 2
+DEFAULT_CROSSFADE_MS = 1000
+DEFAULT_MAX_VOICES = 2  # Copies of one sound allowed to play at once
+DEFAULT_PRIORITY = 0  # Higher priority sounds may steal channels from lower ones
+
+# Footsteps replay every FOOTSTEP_STRIDE pixels walked, about one walking.wav at full speed
+FOOTSTEP_STRIDE = 450
+
+
+class SoundSettings:
+    def __init__(self, sound, max_voices, priority, reserved):
+        self.sound = sound
+        self.max_voices = max_voices
+        self.priority = priority
+        self.reserved = reserved
+
+
 class AudioManager:
-    def __init__(self):
+    """Plays music and sound effects through a fixed pool of mixer channels.
+
+    Each sound has a voice limit, a priority and optionally a reserved channel set.
+    When a sound is at its voice limit its oldest voice is restarted; when the pool
+    is full the oldest voice of the lowest priority at or below the new sound's
+    priority is stolen, and if there is none the new sound is dropped.
+
+    Music tracks are decoded on a background thread and crossfaded on their own
+    channels, so changing music never blocks a frame. Call update() once a frame
+    to start queued tracks that have finished decoding.
+
+    pygame can only stream one track at a time through pygame.mixer.music, which
+    can't crossfade and opens the file on the calling thread, so tracks are decoded
+    whole instead: about 32 MB for three minutes of 44.1 kHz stereo. A track is
+    released once it has faded out, so at most the playing track, one fading out
+    and any preloaded or queued ones are held at once.
+    """
+
+    def __init__(self, channels=MIXER_CHANNELS, reserved=RESERVED_CHANNELS):
         pygame.mixer.init()
+        pygame.mixer.set_num_channels(channels)
+        pygame.mixer.set_reserved(MUSIC_CHANNELS + reserved)
+        self.music_channels = [pygame.mixer.Channel(i) for i in range(MUSIC_CHANNELS)]
+        self.reserved_channels = [pygame.mixer.Channel(i) for i in range(MUSIC_CHANNELS, MUSIC_CHANNELS + reserved)]
+        self.channels = [pygame.mixer.Channel(i) for i in range(MUSIC_CHANNELS + reserved, channels)]
         self.sounds = {}
+        self.voices = {}  # Channel -> (sound name, priority, start time) of what it last played
+
         self.music = None
+        self.music_loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix='music-loader')
+        self.tracks = {}  # filepath -> Future of the decoded track
+        self.queued_music = None  # (filepath, loops, fade_ms) waiting for its track to decode
+        self.current_track = None
+        self.current_music_channel = None
+        self.retiring_tracks = []  # (channel, filepath, fade_ms) of tracks fading or stopped, freed once silent
+        self.music_volume = 1
+
+    def load_sound(self, name, filepath, max_voices=DEFAULT_MAX_VOICES, priority=DEFAULT_PRIORITY, reserved=False):
+        self.sounds[name] = SoundSettings(pygame.mixer.Sound(filepath), max_voices, priority, reserved)
+
+    def playing(self, name, channels):
+        """Return the channels in channels currently playing the named sound."""
+        return [channel for channel in channels
+                if channel.get_busy() and self.voices.get(channel, (None,))[0] == name]
+
+    def find_channel(self, name, settings):
+        channels = self.reserved_channels if settings.reserved else self.channels
 
-    def load_sound(self, name, filepath):
-        self.sounds[name] = pygame.mixer.Sound(filepath)
+        # At the voice limit, restart this sound's oldest voice rather than stacking another
+        voices = self.playing(name, channels)
+        if len(voices) >= settings.max_voices:
+            return min(voices, key=lambda channel: self.voices[channel][2])
+
+        for channel in channels:
+            if not channel.get_busy():
+                return channel
+
+        # Pool is full, steal the least important, oldest voice this sound outranks
+        candidates = [channel for channel in channels if self.voices.get(channel, (None, DEFAULT_PRIORITY))[1] <= settings.priority]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda channel: self.voices.get(channel, (None, DEFAULT_PRIORITY, 0))[1:])
 
     def play_sound(self, name, loops=0):
-        if name in self.sounds:
-            self.sounds[name].play(loops=loops)
+        """Play a loaded sound and return its channel, or None if it was dropped."""
+        settings = self.sounds.get(name)
+        if settings is None:
+            return None
+        channel = self.find_channel(name, settings)
+        if channel is None:
+            return None
+        channel.play(settings.sound, loops=loops)
+        self.voices[channel] = (name, settings.priority, pygame.time.get_ticks())
+        return channel
 
     def stop_sound(self, name):
         if name in self.sounds:
-            self.sounds[name].stop()
+            self.sounds[name].sound.stop()
+
+    def preload_music(self, filepath):
+        """Start decoding a track in the background; returns its Future."""
+        track = self.tracks.get(filepath)
+        if track is None:
+            track = self.tracks[filepath] = self.music_loader.submit(pygame.mixer.Sound, filepath)
+        return track
+
+    def queue_music(self, filepath, loops=-1, fade_ms=DEFAULT_CROSSFADE_MS):
+        """Crossfade to a track as soon as it has decoded, replacing any track still queued."""
+        self.preload_music(filepath)
+        self.queued_music = (filepath, loops, fade_ms)
+        self.update()
+
+    def update(self):
+        """Start the queued track if it's ready and free faded out ones; cheap enough to call every frame."""
+        if self.retiring_tracks:
+            self.release_tracks()
+        if self.queued_music is None:
+            return
+        filepath, loops, fade_ms = self.queued_music
+        track = self.tracks[filepath]
+        if not track.done():
+            return
+        self.queued_music = None
+        try:
+            sound = track.result()
+        except (pygame.error, OSError) as e:
+            # Music files aren't shipped with every checkout; play on without them
+            del self.tracks[filepath]
+            print(f"Could not load music {filepath}: {e}", file=sys.stderr)
+            return
+
+        previous = self.current_music_channel
+        if filepath == self.current_track and previous.get_busy():
+            return
+        channel = self.music_channels[1] if previous is self.music_channels[0] else self.music_channels[0]
+        sound.set_volume(self.music_volume)
+        channel.play(sound, loops=loops, fade_ms=fade_ms)
+        if previous is not None:
+            if fade_ms:
+                previous.fadeout(fade_ms)
+            else:
+                previous.stop()
+            self.retiring_tracks.append((previous, self.current_track, fade_ms))
+        self.current_music_channel = channel
+        self.current_track = filepath
+
+    def release_tracks(self):
+        """Drop decoded tracks that have finished fading out, unless they're wanted again."""
+        still_fading = []
+        for channel, filepath, fade_ms in self.retiring_tracks:
+            track = self.tracks.get(filepath)
+            wanted = filepath == self.current_track or (self.queued_music and filepath == self.queued_music[0])
+            if track is None or wanted:
+                continue
+            if channel.get_busy() and channel.get_sound() is track.result():
+                # SDL ignores a fadeout on a channel whose fade in hasn't started yet, so ask
+                # again; it's a no-op once the channel is already fading out
+                channel.fadeout(fade_ms)
+                still_fading.append((channel, filepath, fade_ms))
+            else:
+                del self.tracks[filepath]
+        self.retiring_tracks = still_fading
+
+    def has_music(self):
+        """Return whether a track is playing or queued to play."""
+        return self.current_track is not None or self.queued_music is not None
 
     def load_music(self, filepath):
         self.music = filepath
+        self.preload_music(filepath)
 
-    def play_music(self, loops=-1):
+    def play_music(self, loops=-1, fade_ms=DEFAULT_CROSSFADE_MS):
         if self.music:
-            pygame.mixer.music.load(self.music)
-            pygame.mixer.music.play(loops=loops)
+            self.queue_music(self.music, loops, fade_ms)
 
-    def stop_music(self):
-        pygame.mixer.music.stop()
+    def stop_music(self, fade_ms=0):
+        self.queued_music = None
+        for channel in self.music_channels:
+            if fade_ms:
+                channel.fadeout(fade_ms)
+            else:
+                channel.stop()
+        if self.current_music_channel is not None:
+            self.retiring_tracks.append((self.current_music_channel, self.current_track, fade_ms))
+        self.current_music_channel = None
+        self.current_track = None
+        self.release_tracks()
 
     def set_music_volume(self, volume):
-        pygame.mixer.music.set_volume(volume)
+        self.music_volume = volume
+        for track in self.tracks.values():
+            if track.done() and not track.exception():
+                track.result().set_volume(volume)
 
     def set_sound_volume(self, name, volume):
         if name in self.sounds:
-            self.sounds[name].set_volume(volume)
\ No newline at end of file
+            self.sounds[name].sound.set_volume(volume)
+
+
+class FootstepScheduler:
+    """Plays footsteps from how far the player actually walks on the ground, not from key presses."""
+
+    def __init__(self, audio_manager, sound='walk', stride=FOOTSTEP_STRIDE):
+        self.audio_manager = audio_manager
+        self.sound = sound
+        self.stride = stride
+        self.walking = False
+        self.distance_to_next = 0
+        self.last_x = None
+
+    def update(self, player):
+        """Call once per simulation tick, after the player has moved."""
+        # Count how far the player really went: change_x stays set while walking into a
+        # wall, and capping by it keeps teleports (spawns, room swaps) from counting as walking
+        moved = 0 if self.last_x is None else min(abs(player.rect.x - self.last_x), abs(player.change_x))
+        self.last_x = player.rect.x
+        if player.on_ground and moved:
+            if self.distance_to_next <= 0:
+                self.audio_manager.play_sound(self.sound)
+                self.distance_to_next += self.stride
+            self.distance_to_next -= moved
+            self.walking = True
+        elif self.walking:
+            # Stopped or left the ground
+            self.walking = False
+            self.distance_to_next = 0
+            self.audio_manager.stop_sound(self.sound)
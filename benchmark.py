@@ -0,0 +1,192 @@
+"""Headless performance benchmark.
+
+Runs the real game loop without a display or audio device, drives it from a
+scripted input timeline and reports frame time statistics per scenario as JSON.
+
+Usage:
+    python benchmark.py [--frames 1200] [--scenarios room1A stress10x stress100x] [--output results.json]
+    python benchmark.py --scenarios stress10x --trace trace.json  # per-phase Chrome trace
+    python benchmark.py --write-levels levels/stress   # dump the synthetic stress rooms
+"""
+import os
+
+# Must be set before pygame is imported
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import contextlib
+import json
+import platform as platform_info
+import random
+import sys
+import tempfile
+import time
+
+import pygame
+import bootstrap
+import main
+from profiler import profiler
+from camera import ROOM_WIDTH, ROOM_HEIGHT
+
+DEFAULT_FRAMES = 1200
+SOURCE_ROOMS = ('room1A', 'room1B')
+SCENARIOS = {
+    # name: how many copies of the source rooms' objects to place
+    'room1A': 1,
+    'stress10x': 10,
+    'stress100x': 100,
+}
+
+# Scripted input, repeated every SCRIPT_PERIOD frames: (frame, event type, key)
+SCRIPT_PERIOD = 360
+INPUT_SCRIPT = [
+    (0, pygame.KEYDOWN, pygame.K_d),     # walk right
+    (40, pygame.KEYDOWN, pygame.K_w),    # jump while walking
+    (80, pygame.KEYDOWN, pygame.K_p),    # melee attack
+    (90, pygame.KEYUP, pygame.K_d),
+    (100, pygame.KEYDOWN, pygame.K_RETURN),  # swap to the B room
+    (110, pygame.KEYDOWN, pygame.K_p),   # shoot arrows
+    (120, pygame.KEYDOWN, pygame.K_p),
+    (130, pygame.KEYDOWN, pygame.K_p),
+    (140, pygame.KEYDOWN, pygame.K_a),   # walk left
+    (180, pygame.KEYDOWN, pygame.K_w),
+    (220, pygame.KEYUP, pygame.K_a),
+    (230, pygame.KEYDOWN, pygame.K_p),
+    (240, pygame.KEYDOWN, pygame.K_RETURN),  # swap back to the A room
+    (260, pygame.KEYDOWN, pygame.K_a),
+    (300, pygame.KEYUP, pygame.K_a),
+    (320, pygame.KEYDOWN, pygame.K_r),   # reset to spawn
+]
+
+
+def build_stress_level(level_data, copies, seed=0):
+    """Return level_data with its platforms, decorations and targets repeated copies times.
+
+    Each extra copy is shifted by a random offset (wrapped to stay inside the room),
+    so the stress room has the same mix of objects at copies times the density.
+    """
+    rng = random.Random(seed)
+    stress = {
+        'platforms': list(level_data['platforms']),
+        'goal': level_data['goal'],
+        'spawn_point': level_data['spawn_point'],
+        'decorations': list(level_data.get('decorations', [])),
+        'targets': list(level_data.get('targets', [])),
+    }
+    for _ in range(copies - 1):
+        dx = rng.randrange(ROOM_WIDTH)
+        dy = rng.randrange(ROOM_HEIGHT)
+        for key in ('platforms', 'decorations', 'targets'):
+            for entry in level_data.get(key, []):
+                entry = dict(entry)
+                entry['x'] = (entry['x'] + dx) % ROOM_WIDTH
+                entry['y'] = (entry['y'] + dy) % ROOM_HEIGHT
+                stress[key].append(entry)
+    return stress
+
+
+def write_levels(directory, copies):
+    """Write stress copies of the source rooms into directory, keeping their room names."""
+    os.makedirs(directory, exist_ok=True)
+    for index, room_name in enumerate(SOURCE_ROOMS):
+        level_data = main.load_level(os.path.join('levels', f'{room_name}.json'))
+        with open(os.path.join(directory, f'{room_name}.json'), 'w') as file:
+            json.dump(build_stress_level(level_data, copies, seed=index), file)
+
+
+def percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, int(round(percent / 100 * len(sorted_values))) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def run_scenario(levels_dir, frames):
+    """Run the game loop for the given number of frames and return its statistics."""
+    main.LEVELS_DIR = levels_dir
+    main.CURRENT_ROOM = SOURCE_ROOMS[0]
+    script = {}
+    for frame, event_type, key in INPUT_SCRIPT:
+        script.setdefault(frame, []).append((event_type, key))
+
+    frame_times = []
+    state = {'frame': 0, 'last': None}
+
+    def on_frame():
+        now = time.perf_counter()
+        if state['last'] is not None:
+            frame_times.append(now - state['last'])
+        state['last'] = now
+        if state['frame'] >= frames:
+            return False
+        for event_type, key in script.get(state['frame'] % SCRIPT_PERIOD, ()):
+            pygame.event.post(pygame.event.Event(event_type, key=key, mod=0, unicode='', scancode=0))
+        state['frame'] += 1
+        return True
+
+    start = time.perf_counter()
+    main.run_game(fps=0, on_frame=on_frame)
+    total = time.perf_counter() - start
+
+    frame_times.sort()
+    return {
+        'frames': len(frame_times),
+        'seconds': round(total, 4),
+        'fps': round(len(frame_times) / sum(frame_times), 2) if frame_times else 0,
+        'mean_ms': round(sum(frame_times) / len(frame_times) * 1000, 3) if frame_times else 0,
+        'p50_ms': round(percentile(frame_times, 50) * 1000, 3) if frame_times else 0,
+        'p95_ms': round(percentile(frame_times, 95) * 1000, 3) if frame_times else 0,
+        'p99_ms': round(percentile(frame_times, 99) * 1000, 3) if frame_times else 0,
+        'max_ms': round(frame_times[-1] * 1000, 3) if frame_times else 0,
+    }
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description='Run the game headless from scripted input and report frame times.')
+    parser.add_argument('--frames', type=int, default=DEFAULT_FRAMES, help='frames to run per scenario')
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    parser.add_argument('--trace', metavar='FILE', help='also export a Chrome trace of every scenario\'s frame phases')
+    parser.add_argument('--write-levels', metavar='DIR', help='write the stress rooms to DIR/<scenario> and exit')
+    args = parser.parse_args()
+
+    if args.write_levels:
+        for name, copies in SCENARIOS.items():
+            if copies > 1:
+                write_levels(os.path.join(args.write_levels, name), copies)
+        return
+
+    profiler.clear()
+    report = {
+        'python': platform_info.python_version(),
+        'pygame': pygame.version.ver,
+        'frames_per_scenario': args.frames,
+        'scenarios': {},
+    }
+    for name in args.scenarios:
+        copies = SCENARIOS[name]
+        with tempfile.TemporaryDirectory() as levels_dir:
+            if copies == 1:
+                levels_dir = 'levels'
+            else:
+                write_levels(levels_dir, copies)
+            # Keep the game's own prints out of the machine readable report
+            with contextlib.redirect_stdout(sys.stderr):
+                report['scenarios'][name] = run_scenario(levels_dir, args.frames)
+
+    report['startup_ms'] = {name: round(seconds * 1000, 3) for name, seconds in bootstrap.stage_times.items()}
+    if args.trace:
+        profiler.export_chrome_trace(args.trace)
+
+    output = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main_benchmark()
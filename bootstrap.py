@@ -0,0 +1,84 @@
+"""Staged application startup shared by the game, the menu and the level editor.
+
+Modules register their asset loaders here instead of loading at import time,
+and each entry point calls start() before its first frame:
+
+    display          pygame and the window
+    mixer            the audio device and the shared AudioManager, unless audio=False
+    core assets      what the first screen needs in order to draw
+    deferred assets  everything else, run by load_deferred() once the first frame is up
+
+Each stage is timed and logged; the timings are kept in stage_times.
+"""
+import time
+import pygame
+from audio_manager import AudioManager
+
+SCREEN_WIDTH = 1300
+SCREEN_HEIGHT = 600
+DEFAULT_CAPTION = "Platformer"
+
+# Set by the display and mixer stages
+screen = None
+audio_manager = None
+
+stage_times = {}  # Stage name -> seconds spent in it
+core_loaders = []
+deferred_loaders = []
+
+
+def core_asset(load):
+    """Decorator registering a loader for the core assets stage."""
+    core_loaders.append(load)
+    return load
+
+
+def deferred_asset(load):
+    """Decorator registering a loader to run after the first frame has been presented."""
+    deferred_loaders.append(load)
+    return load
+
+
+def run_stage(name, loaders):
+    start_time = time.perf_counter()
+    for load in loaders:
+        load()
+    elapsed = time.perf_counter() - start_time
+    stage_times[name] = stage_times.get(name, 0) + elapsed
+    print(f"Startup stage {name}: {elapsed * 1000:.1f} ms")
+
+
+def init_display(caption):
+    global screen
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption(caption)
+
+
+def init_mixer():
+    global audio_manager
+    audio_manager = AudioManager()
+
+
+def start(caption=DEFAULT_CAPTION, audio=True):
+    """Run the display, mixer and core asset stages. Safe to call again; later calls only load new core assets.
+
+    Entry points that play no sound (the level editor) pass audio=False so they
+    don't need an audio device.
+    """
+    if screen is None:
+        run_stage('display', [lambda: init_display(caption)])
+    if audio and audio_manager is None:
+        run_stage('mixer', [init_mixer])
+    if core_loaders:
+        loaders = core_loaders[:]
+        core_loaders.clear()
+        run_stage('core assets', loaders)
+
+
+def load_deferred():
+    """Run the deferred asset loaders that haven't run yet."""
+    if deferred_loaders:
+        loaders = deferred_loaders[:]
+        deferred_loaders.clear()
+        run_stage('deferred assets', loaders)
@@ -28,4 +28,8 @@ class Camera:
         y = max(-(ROOM_HEIGHT - SCREEN_HEIGHT), y)  # Don't scroll past the bottom edge
 
         # Update the camera's position
-        self.camera = pygame.Rect(x, y, self.width, self.height)
\ No newline at end of file
+        self.camera = pygame.Rect(x, y, self.width, self.height)
+
+    def visible_rect(self):
+        """Return the part of the room currently on screen, in room coordinates."""
+        return pygame.Rect(-self.camera.x, -self.camera.y, self.width, self.height)
@@ -0,0 +1,58 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from asset_cache import load_image
+
+DECORATIONS_DIR = 'sprites/decorations'
+DECORATION_EXTENSION = '.png'
+
+
+class DecorationRegistry:
+    """Decoration types available on disk, each decoded only when something first uses it.
+
+    The directory is listed on the first lookup; images come from the shared asset
+    cache, so the game's room loader thread and the editor share decoded surfaces.
+    """
+
+    def __init__(self, directory=DECORATIONS_DIR):
+        self.directory = directory
+        self.type_names = None
+        self.executor = None
+
+    def names(self):
+        """Return every decoration type name, in directory order."""
+        if self.type_names is None:
+            self.type_names = [
+                name[:-len(DECORATION_EXTENSION)]
+                for name in os.listdir(self.directory)
+                if name.endswith(DECORATION_EXTENSION)
+            ]
+        return self.type_names
+
+    def __contains__(self, name):
+        return name in self.names()
+
+    def __getitem__(self, name):
+        if name not in self.names():
+            raise KeyError(name)
+        return load_image(os.path.join(self.directory, name + DECORATION_EXTENSION))
+
+    def preload(self, names):
+        """Decode decoration types on a background thread ahead of use.
+
+        names is an iterable of type names, or a callable returning one so that
+        working out the names (e.g. reading the next level) also happens off thread.
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='decoration-loader')
+        return self.executor.submit(self.load_all, names)
+
+    def load_all(self, names):
+        if callable(names):
+            names = names()
+        for name in names:
+            if name in self:
+                self[name]
+
+
+# Shared by the game and the level editor
+decoration_types = DecorationRegistry()
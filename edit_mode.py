@@ -1,14 +1,16 @@
 import pygame
 import json
-import os
+import bootstrap
 from game_objects.platform import Platform
 from game_objects.goal import Goal
 from game_objects.spawn_point import SpawnPoint
 from game_objects.decoration import Decoration
 from game_objects.target import Target
-
-# Initialize Pygame
-pygame.init()
+from renderer import ZOrderedGroup, presenter
+from spatial_grid import SpatialGrid
+from level_writer import LevelWriter
+from decoration_registry import decoration_types
+from text_cache import draw_number, render_text
 
 # Screen dimensions
 SCREEN_WIDTH = 1300
@@ -16,6 +18,8 @@ SCREEN_HEIGHT = 600
 
 # Zoom factor (0.5 means zoomed out by double)
 ZOOM_FACTOR = 0.5
+# Selectable zoom levels, each half the one before so every level is scaled from the next larger one
+ZOOM_LEVELS = (1, 0.5, 0.25, 0.125)
 
 # Colors
 WHITE = (255, 255, 255)
@@ -24,17 +28,24 @@ GREY = (100, 100, 100)
 BROWN = (139, 69, 19)
 RED = (255, 0, 0)
 
+# Unsaved edits are written in the background at most this often, in milliseconds
+AUTOSAVE_INTERVAL = 5000
+
 # Button dimensions
 BUTTON_WIDTH = 50
 BUTTON_HEIGHT = 50
 
-# Initialize screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Edit Mode (Zoomed Out)")
-
 # Clock for controlling frame rate
 clock = pygame.time.Clock()
 
+# Set by bootstrap.start()
+screen = None
+
+@bootstrap.core_asset
+def load_editor_screen():
+    global screen
+    screen = bootstrap.screen
+
 # List of room filenames
 ROOMS = [
     'levels/room1A.json',
@@ -45,13 +56,6 @@ ROOMS = [
     'levels/room3B.json',
 ]
 
-# Load all decoration types from the decorations folder
-DECORATION_TYPES = {
-    name.split('.')[0]: pygame.image.load(os.path.join('sprites/decorations', name)).convert_alpha()
-    for name in os.listdir('sprites/decorations')
-    if name.endswith('.png')
-}
-
 def load_level(filename):
     """Load level data from a JSON file."""
     try:
@@ -68,9 +72,49 @@ def load_level(filename):
             'decorations': []
         }
 
+class PickGroup(ZOrderedGroup):
+    """Editor sprites in draw order, with a SpatialGrid of their unscaled rects for mouse picking."""
+
+    def __init__(self, *sprites):
+        self.grid = SpatialGrid()
+        self.stacking = {}  # Sprite -> counter, higher is drawn later within its z-index
+        self.next_stacking = 0
+        super().__init__(*sprites)
+
+    def restack(self, sprite):
+        # Sprites added or moved to a layer go on top of that layer, as in LayeredUpdates
+        self.stacking[sprite] = self.next_stacking
+        self.next_stacking += 1
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.grid.insert(sprite, sprite.rect)
+        self.restack(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.grid.remove(sprite)
+        del self.stacking[sprite]
+
+    def set_z_index(self, sprite, z_index):
+        super().set_z_index(sprite, z_index)
+        self.restack(sprite)
+
+    def reindex(self, sprite):
+        """Call after moving, resizing or rotating a sprite in this group."""
+        # The selection can outlive a room switch, so ignore sprites from other rooms
+        if self.has_internal(sprite):
+            self.grid.move(sprite, sprite.rect)
+
+    def pick(self, point):
+        """Return the sprites under an unscaled room point, topmost first."""
+        hits = [sprite for sprite in self.grid.query(pygame.Rect(point, (1, 1))) if sprite.rect.collidepoint(point)]
+        hits.sort(key=lambda sprite: (self._spritelayers[sprite], self.stacking[sprite]), reverse=True)
+        return hits
+
 def load_sprites(level_data):
-    # initialize sprite groups
-    all_sprites = pygame.sprite.Group()
+    # initialize sprite groups, all_sprites keeps itself sorted by z-index and indexed for picking
+    all_sprites = PickGroup()
     platforms = pygame.sprite.Group()
     decorations = pygame.sprite.Group()
     targets = pygame.sprite.Group()
@@ -105,31 +149,69 @@ def load_sprites(level_data):
     # Load decorations
     for decoration_data in level_data.get('decorations', []):
         decoration = Decoration(
-            DECORATION_TYPES[decoration_data['type']],
+            decoration_types[decoration_data['type']],
             decoration_data['x'],
             decoration_data['y'],
             decoration_data['z_index'],
-            decoration_data.get('scale', 1)
+            decoration_data.get('scale', 1),
+            decoration_data['type']
         )
-        decoration.decoration_type = decoration_data['type']
         decorations.add(decoration)
         all_sprites.add(decoration)
 
     return all_sprites, platforms, goal, spawn_point, decorations, targets
 
-def draw_sprite(sprite):
-    scaled_rect = pygame.Rect(
-        sprite.rect.x * ZOOM_FACTOR,
-        sprite.rect.y * ZOOM_FACTOR,
-        sprite.rect.width * ZOOM_FACTOR,
-        sprite.rect.height * ZOOM_FACTOR
-    )
-    scaled_image = pygame.transform.scale(sprite.image, (scaled_rect.width, scaled_rect.height))
-    return scaled_rect, scaled_image
-
-def save_level(filename, platforms, goal, spawn_point, decorations, targets):
-    """Save level data to a JSON file."""
-    level_data = {
+class ZoomCache:
+    """Scaled copies of sprite images for each zoom level, kept until the source image changes.
+
+    Entries are keyed by the identity of the source surface and the target size. Call
+    invalidate(image) before resizing, rotating or rescaling the sprite that owns it.
+    """
+
+    def __init__(self):
+        self.entries = {}  # id(source) -> (source, {size: scaled surface})
+
+    def get(self, image, zoom):
+        if zoom == 1:
+            return image
+        width, height = image.get_size()
+        size = (int(width * zoom), int(height * zoom))
+        entry = self.entries.get(id(image))
+        if entry is None or entry[0] is not image:
+            # A new surface, or an id reused after the old surface was freed
+            entry = (image, {})
+            self.entries[id(image)] = entry
+        scaled = entry[1].get(size)
+        if scaled is None:
+            # Scale down from the next larger zoom level rather than from full size
+            parent = self.get(image, zoom * 2) if zoom * 2 in ZOOM_LEVELS else image
+            scaled = pygame.transform.scale(parent, size)
+            entry[1][size] = scaled
+        return scaled
+
+    def invalidate(self, image):
+        self.entries.pop(id(image), None)
+
+    def clear(self):
+        self.entries.clear()
+
+
+# Shared by the editor's draw loop
+zoom_cache = ZoomCache()
+
+def scale_rect(rect, zoom):
+    return pygame.Rect(rect.x * zoom, rect.y * zoom, rect.width * zoom, rect.height * zoom)
+
+def draw_sprite(sprite, zoom=ZOOM_FACTOR):
+    """Return the screen position and cached zoomed image of a sprite."""
+    return (int(sprite.rect.x * zoom), int(sprite.rect.y * zoom)), zoom_cache.get(sprite.image, zoom)
+
+# Writes saved rooms on a background thread
+level_writer = LevelWriter()
+
+def level_to_data(platforms, goal, spawn_point, decorations, targets):
+    """Build the JSON level dict for the room's current sprites."""
+    return {
         'platforms': [{'x': p.rect.x, 'y': p.rect.y, 'width': p.width, 'height': p.height, 'breakable': p.breakable}
                       for p in platforms],
         'goal': {'x': goal.rect.x, 'y': goal.rect.y, 'width': goal.width, 'height': goal.height},
@@ -138,23 +220,42 @@ def save_level(filename, platforms, goal, spawn_point, decorations, targets):
                         for d in decorations],
         'targets': [{'x': t.rect.x, 'y': t.rect.y} for t in targets]
     }
-    with open(filename, 'w') as file:
-        json.dump(level_data, file, indent=4)
+
+def save_level(filename, platforms, goal, spawn_point, decorations, targets):
+    """Queue the room to be written to its JSON file; returns without waiting for the disk."""
+    level_writer.save(filename, level_to_data(platforms, goal, spawn_point, decorations, targets))
+
+def open_room(filename):
+    """Load a room, preferring edits that are saved but still waiting to be written."""
+    return level_writer.latest(filename) or load_level(filename)
+
+def preload_neighbours(room_index):
+    """Decode the decorations of the rooms either side of room_index in the background."""
+    for index in (room_index - 1, room_index + 1):
+        filename = ROOMS[index % len(ROOMS)]
+        decoration_types.preload(lambda filename=filename: [d['type'] for d in open_room(filename).get('decorations', [])])
 
 def main():
+    bootstrap.start("Edit Mode (Zoomed Out)", audio=False)
+
     # Current room index
     current_room_index = 0
-    current_decoration_type = list(DECORATION_TYPES.keys())[0]  # Start with first decoration
+    current_decoration_type = decoration_types.names()[0]  # Start with first decoration
 
     # Load level data for the current room
-    level_data = load_level(ROOMS[current_room_index])
+    level_data = open_room(ROOMS[current_room_index])
 
     # Load sprites off of data
     all_sprites, platforms, goal, spawn_point, decorations, targets = load_sprites(level_data)
+    preload_neighbours(current_room_index)
 
     selected_object = None
     offset_x = 0
     offset_y = 0
+    zoom = ZOOM_FACTOR
+    # Whether the current room has edits that haven't been saved yet
+    dirty = False
+    last_autosave = pygame.time.get_ticks()
 
     # Load button images
     add_button_image = pygame.image.load('sprites/edit_mode/add_button.png').convert_alpha()
@@ -180,41 +281,50 @@ def main():
         topleft=(SCREEN_WIDTH - BUTTON_WIDTH - 10, 4 * BUTTON_HEIGHT + 50)
     )
 
-    # Font for displaying current decoration and z-index
-    font = pygame.font.Font(None, 24)  # Default font, size 24
+    # Font size for displaying current decoration and z-index
+    font_size = 24  # Default font, size 24
 
     running = True
     while running:
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        # The editor only changes in response to input, so idle frames present nothing
+        if events:
+            presenter.invalidate()
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                scaled_mouse_pos = (event.pos[0] / ZOOM_FACTOR, event.pos[1] / ZOOM_FACTOR)
+                scaled_mouse_pos = (event.pos[0] / zoom, event.pos[1] / zoom)
 
                 if decoration_cycle_rect.collidepoint(event.pos):
                     # Cycle through decoration types
-                    current_types = list(DECORATION_TYPES.keys())
+                    current_types = decoration_types.names()
                     current_index = current_types.index(current_decoration_type)
                     current_decoration_type = current_types[(current_index + 1) % len(current_types)]
                 elif add_decoration_rect.collidepoint(event.pos):
                     # Add new decoration at default position
-                    new_decoration = Decoration(DECORATION_TYPES[current_decoration_type], 100, 100, 0)
-                    new_decoration.decoration_type = current_decoration_type
+                    new_decoration = Decoration(decoration_types[current_decoration_type], 100, 100, 0,
+                                                decoration_type=current_decoration_type)
                     decorations.add(new_decoration)
                     all_sprites.add(new_decoration)
+                    dirty = True
                 elif add_button_rect.collidepoint(event.pos):
                     # Add a new platform at a default position (unscaled)
                     new_platform = Platform(100, 100, 200, 20)
                     platforms.add(new_platform)
                     all_sprites.add(new_platform)
+                    dirty = True
                 elif add_target_rect.collidepoint(event.pos):
                     # Add a new target at a default position (unscaled)
                     new_target = Target(100, 100)
                     targets.add(new_target)
                     all_sprites.add(new_target)
+                    dirty = True
                 elif prev_button_rect.collidepoint(event.pos) or next_button_rect.collidepoint(event.pos):
-                    # Save current room before switching
-                    save_level(ROOMS[current_room_index], platforms, goal, spawn_point, decorations, targets)
+                    # Save current room before switching, if it was edited
+                    if dirty:
+                        save_level(ROOMS[current_room_index], platforms, goal, spawn_point, decorations, targets)
+                        dirty = False
 
                     # Update room index
                     if prev_button_rect.collidepoint(event.pos):
@@ -223,92 +333,114 @@ def main():
                         current_room_index = (current_room_index + 1) % len(ROOMS)
 
                     # Load new room
-                    level_data = load_level(ROOMS[current_room_index])
+                    level_data = open_room(ROOMS[current_room_index])
 
                     # Clear all sprites
                     platforms.empty()
                     decorations.empty()
                     all_sprites.empty()
+                    zoom_cache.clear()
 
                     # Load new sprites
                     all_sprites, platforms, goal, spawn_point, decorations, targets = load_sprites(level_data)
+                    preload_neighbours(current_room_index)
 
                 else:
-                    for obj in all_sprites:
-                        # Check collision with scaled object rect
-                        scaled_rect = pygame.Rect(
-                            obj.rect.x * ZOOM_FACTOR,
-                            obj.rect.y * ZOOM_FACTOR,
-                            obj.rect.width * ZOOM_FACTOR,
-                            obj.rect.height * ZOOM_FACTOR
-                        )
-                        if scaled_rect.collidepoint(event.pos):
-                            selected_object = obj
-                            offset_x = obj.rect.x - scaled_mouse_pos[0]
-                            offset_y = obj.rect.y - scaled_mouse_pos[1]
-                            break
+                    # Select the topmost object under the cursor
+                    hits = all_sprites.pick((int(scaled_mouse_pos[0]), int(scaled_mouse_pos[1])))
+                    if hits:
+                        selected_object = hits[0]
+                        offset_x = selected_object.rect.x - scaled_mouse_pos[0]
+                        offset_y = selected_object.rect.y - scaled_mouse_pos[1]
 
                 # Check right click to rotate (only for platforms)
                 if event.button == 3 and isinstance(selected_object, Platform):
+                    zoom_cache.invalidate(selected_object.image)
                     selected_object.rotate()
+                    all_sprites.reindex(selected_object)
+                    dirty = True
 
             elif event.type == pygame.MOUSEBUTTONUP:
                 if selected_object and minus_button_rect.collidepoint(event.pos):
                     # Remove the selected object
+                    zoom_cache.invalidate(selected_object.image)
                     if isinstance(selected_object, Platform):
                         platforms.remove(selected_object)
                     elif isinstance(selected_object, Decoration):
                         decorations.remove(selected_object)
                     all_sprites.remove(selected_object)
+                    dirty = True
                 selected_object = None
             elif event.type == pygame.MOUSEMOTION:
                 if selected_object:
                     # Scale mouse position for movement
-                    scaled_mouse_pos = (event.pos[0] / ZOOM_FACTOR, event.pos[1] / ZOOM_FACTOR)
+                    scaled_mouse_pos = (event.pos[0] / zoom, event.pos[1] / zoom)
                     selected_object.rect.x = scaled_mouse_pos[0] + offset_x
                     selected_object.rect.y = scaled_mouse_pos[1] + offset_y
+                    all_sprites.reindex(selected_object)
+                    dirty = True
             elif event.type == pygame.KEYDOWN:
-                if selected_object and isinstance(selected_object, Platform):
+                if event.key in (pygame.K_EQUALS, pygame.K_MINUS):
+                    # Step through the zoom pyramid
+                    zoom_index = ZOOM_LEVELS.index(zoom) + (-1 if event.key == pygame.K_EQUALS else 1)
+                    zoom = ZOOM_LEVELS[max(0, min(len(ZOOM_LEVELS) - 1, zoom_index))]
+                elif selected_object and isinstance(selected_object, Platform):
                     if event.key == pygame.K_w:
                         selected_object.rect.width += 10
+                        dirty = True
                     elif event.key == pygame.K_s:
                         selected_object.rect.width = max(10, selected_object.rect.width - 10)
+                        dirty = True
                     elif event.key == pygame.K_b:
                         selected_object.breakable = not selected_object.breakable
+                        dirty = True
                     # Update the platform's image to reflect the new width
+                    zoom_cache.invalidate(selected_object.image)
                     selected_object.image = pygame.Surface((selected_object.rect.width, selected_object.rect.height))
                     selected_object.width, selected_object.height = selected_object.rect.width, selected_object.rect.height
                     if selected_object.breakable:
                         selected_object.image.fill(BROWN)
                     else:
                         selected_object.image.fill(BLACK)
+                    all_sprites.reindex(selected_object)
 
                 elif selected_object and isinstance(selected_object, Decoration):
                     if event.key == pygame.K_UP:
-                        selected_object.z_index += 1
+                        all_sprites.set_z_index(selected_object, selected_object.z_index + 1)
+                        dirty = True
                     elif event.key == pygame.K_DOWN:
-                        selected_object.z_index -= 1
+                        all_sprites.set_z_index(selected_object, selected_object.z_index - 1)
+                        dirty = True
                     elif event.key == pygame.K_RIGHT:
+                        zoom_cache.invalidate(selected_object.image)
                         selected_object.set_scale(min(2, selected_object.scale + 0.1))
+                        all_sprites.reindex(selected_object)
+                        dirty = True
                     elif event.key == pygame.K_LEFT:
+                        zoom_cache.invalidate(selected_object.image)
                         selected_object.set_scale(max(0.1, selected_object.scale - 0.1))
+                        all_sprites.reindex(selected_object)
+                        dirty = True
+
+        # Autosave, so a burst of edits turns into one background write
+        now = pygame.time.get_ticks()
+        if dirty and now - last_autosave >= AUTOSAVE_INTERVAL:
+            save_level(ROOMS[current_room_index], platforms, goal, spawn_point, decorations, targets)
+            dirty = False
+            last_autosave = now
 
         # Draw everything
         screen.fill(WHITE)
 
-        # Sort all sprites by z-index
-        sorted_sprites = sorted(all_sprites.sprites(), key=lambda x: getattr(x, 'z_index', 0))
-
-        # Draw all sprites in order
-        for sprite in sorted_sprites:
-            scaled_rect, scaled_image = draw_sprite(sprite)
-            screen.blit(scaled_image, scaled_rect.topleft)
+        # Draw all sprites in z-index order
+        for sprite in all_sprites.ordered():
+            position, scaled_image = draw_sprite(sprite, zoom)
+            screen.blit(scaled_image, position)
 
             # Display z-index for decorations
             if isinstance(sprite, Decoration):
-                z_index_text = font.render(f"z: {sprite.z_index}", True, (255,0,0))
-                text_position = (scaled_rect.x, scaled_rect.y - 20)  # Position text above the decoration
-                screen.blit(z_index_text, text_position)
+                text_position = (position[0], position[1] - 20)  # Position text above the decoration
+                draw_number(screen, text_position, sprite.z_index, font_size, (255,0,0), prefix="z: ")
 
         # Draw all buttons (not scaled)
         screen.blit(add_button_image, add_button_rect.topleft)
@@ -320,29 +452,26 @@ def main():
         screen.blit(add_target_image, add_target_rect.topleft)
 
         # Display current decoration type
-        decoration_text = font.render(f"Current: {current_decoration_type}", True, (0,255,0))
+        decoration_text = render_text(f"Current: {current_decoration_type}", font_size, (0,255,0))
         screen.blit(decoration_text, (SCREEN_WIDTH - 200, 3 * BUTTON_HEIGHT + 40))
 
         # Highlight selected object
         if selected_object:
-            scaled_selected_rect = pygame.Rect(
-                selected_object.rect.x * ZOOM_FACTOR,
-                selected_object.rect.y * ZOOM_FACTOR,
-                selected_object.rect.width * ZOOM_FACTOR,
-                selected_object.rect.height * ZOOM_FACTOR
-            )
+            scaled_selected_rect = scale_rect(selected_object.rect, zoom)
             pygame.draw.rect(screen, RED, scaled_selected_rect, 2)
 
         # Display current room name
         room_name = ROOMS[current_room_index].split('/')[-1]
-        room_text = font.render(f"Room: {room_name}", True, BLACK)
+        room_text = render_text(f"Room: {room_name}", font_size, BLACK)
         screen.blit(room_text, (SCREEN_WIDTH // 2 - 100, 10))
 
-        pygame.display.flip()
+        presenter.present()
         clock.tick(60)
 
-    # Save final state before quitting
-    save_level(ROOMS[current_room_index], platforms, goal, spawn_point, decorations, targets)
+    # Save final state before quitting and wait for every write to reach the disk
+    if dirty:
+        save_level(ROOMS[current_room_index], platforms, goal, spawn_point, decorations, targets)
+    level_writer.flush()
 
     pygame.quit()
 
@@ -1,11 +1,39 @@
+import threading
+import weakref
 import pygame
 
+SCALE_PRECISION = 2  # Decimal places a scale is rounded to before looking up a shared surface
+
+# (decoration type, rounded scale) -> scaled surface shared by every decoration using it.
+# Entries disappear once no decoration holds the surface any more, e.g. when a room unloads.
+scaled_images = weakref.WeakValueDictionary()
+# Rooms are built on the room loader thread while the game runs
+scaled_images_lock = threading.Lock()
+
+
+def get_scaled_image(decoration_type, image, scale):
+    """Return image scaled by scale, shared with other decorations of the same type and scale."""
+    scale = round(scale, SCALE_PRECISION)
+    size = (int(image.get_width() * scale), int(image.get_height() * scale))
+    if decoration_type is None:
+        return pygame.transform.scale(image, size)
+
+    key = (decoration_type, scale)
+    with scaled_images_lock:
+        scaled = scaled_images.get(key)
+        if scaled is None:
+            scaled = image if size == image.get_size() else pygame.transform.scale(image, size)
+            scaled_images[key] = scaled
+    return scaled
+
+
 class Decoration(pygame.sprite.Sprite):
-    def __init__(self, image, x, y, z_index, scale=1):
+    def __init__(self, image, x, y, z_index, scale=1, decoration_type=None):
         super().__init__()
         self.original_image = image
+        self.decoration_type = decoration_type
         self.scale = scale
-        self.image = pygame.transform.scale(self.original_image, (int(self.original_image.get_width() * self.scale), int(self.original_image.get_height() * self.scale)))
+        self.image = get_scaled_image(decoration_type, self.original_image, self.scale)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
@@ -14,8 +42,8 @@ class Decoration(pygame.sprite.Sprite):
 
     def set_scale(self, new_scale):
         self.scale = new_scale
-        self.image = pygame.transform.scale(self.original_image, (int(self.original_image.get_width() * self.scale), int(self.original_image.get_height() * self.scale)))
+        self.image = get_scaled_image(self.decoration_type, self.original_image, self.scale)
         self.rect = self.image.get_rect(topleft=(self.rect.x, self.rect.y))
 
     def draw(self, screen):
-        screen.blit(self.image, self.rect)
\ No newline at end of file
+        screen.blit(self.image, self.rect)
@@ -1,10 +1,10 @@
 import pygame
+from asset_cache import load_image
 
 class Goal(pygame.sprite.Sprite):
     def __init__(self, x, y, width, height):
         super().__init__()
-        self.image = pygame.image.load('sprites/interactive/goal.png').convert_alpha()
-        self.image = pygame.transform.scale(self.image, (width, height))
+        self.image = load_image('sprites/interactive/goal.png', (width, height))
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
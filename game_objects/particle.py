@@ -1,46 +1,122 @@
+import numpy as np
 import pygame
-import random
 
+MAX_PARTICLES = 512  # Particles beyond this are dropped until older ones die
+PARTICLE_GRAVITY = 0.5
+PARTICLE_LIFETIME = 60  # Number of frames a particle lives
+FADE_STEPS = 16  # Number of pre-faded alpha levels cached per particle surface
+PARTICLE_SIZE_STEP = 5  # Particle sizes snap to multiples of this so few surfaces are needed
+MAX_CACHED_SURFACES = 256  # The surface cache is emptied when it grows past this
 
-class Particle(pygame.sprite.Sprite):
-    def __init__(self, color, x, y, width, height, dx, dy):
-        super().__init__()
-        self.image = pygame.Surface([width, height])
-        self.image.fill(color)
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y
 
-        # Movement variables
-        self.x = float(x)  # Store precise positions as floats
-        self.y = float(y)
-        self.dx = dx  # Horizontal velocity
-        self.dy = dy  # Vertical velocity
+def snap_size(size):
+    """Round a particle size (a number or an array of them) to the nearest PARTICLE_SIZE_STEP."""
+    return np.maximum((size + PARTICLE_SIZE_STEP // 2) // PARTICLE_SIZE_STEP * PARTICLE_SIZE_STEP, PARTICLE_SIZE_STEP)
 
-        # Particle properties
-        self.gravity = 0.5
-        self.lifetime = 60  # Number of frames the particle will live
-        self.alpha = 255  # Start fully opaque
-        self.fade_rate = 255 / self.lifetime  # How quickly to fade out
 
-        # Make background transparent
-        self.image.set_colorkey((0, 0, 0))
+class ParticleSystem:
+    """All live particles stored in preallocated arrays and stepped together."""
+
+    def __init__(self, capacity=MAX_PARTICLES):
+        self.capacity = capacity
+        self.count = 0
+        self.position = np.zeros((capacity, 2), dtype=np.float32)
+        self.velocity = np.zeros((capacity, 2), dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.int16)
+        self.size = np.zeros((capacity, 2), dtype=np.int16)
+        self.color = np.zeros(capacity, dtype=np.int16)  # Index into self.colors
+        self.colors = []
+        self.surfaces = {}
+        self.rng = np.random.default_rng()
+
+    def color_index(self, color):
+        color = tuple(color)
+        if color not in self.colors:
+            self.colors.append(color)
+        return self.colors.index(color)
+
+    def emit(self, color, x, y, width, height, dx, dy):
+        """Add one particle; arguments match the old per-sprite Particle."""
+        if self.count >= self.capacity:
+            return
+        i = self.count
+        self.position[i] = (x, y)
+        self.velocity[i] = (dx, dy)
+        self.size[i] = (snap_size(width), snap_size(height))
+        self.lifetime[i] = PARTICLE_LIFETIME
+        self.color[i] = self.color_index(color)
+        self.count += 1
+
+    def burst(self, color, center, amount=3):
+        """Emit a small spray of randomly sized particles around center."""
+        amount = min(amount, self.capacity - self.count)
+        if amount <= 0:
+            return
+        start, end = self.count, self.count + amount
+        rng = self.rng
+        self.position[start:end, 0] = center[0] + rng.integers(-10, 11, amount)  # Spread particles around
+        self.position[start:end, 1] = center[1] + rng.integers(-10, 11, amount)
+        self.size[start:end, 0] = snap_size(rng.integers(10, 21, amount))  # Random sizes
+        self.size[start:end, 1] = snap_size(rng.integers(10, 16, amount))
+        self.velocity[start:end, 0] = rng.uniform(-3, 3, amount)  # Random horizontal velocity
+        self.velocity[start:end, 1] = rng.uniform(-8, -4, amount)  # Initial upward velocity
+        self.lifetime[start:end] = PARTICLE_LIFETIME
+        self.color[start:end] = self.color_index(color)
+        self.count = end
 
     def update(self):
-        # Update position
-        self.x += self.dx
-        self.y += self.dy
-        self.dy += self.gravity  # Apply gravity
-
-        # Update rect position
-        self.rect.x = int(self.x)
-        self.rect.y = int(self.y)
-
-        # Update lifetime and alpha
-        self.lifetime -= 1
-        self.alpha = max(0, self.alpha - self.fade_rate)
-        self.image.set_alpha(int(self.alpha))
-
-        # Kill the particle if its lifetime is over
-        if self.lifetime <= 0:
-            self.kill()
\ No newline at end of file
+        n = self.count
+        if n == 0:
+            return
+        self.position[:n] += self.velocity[:n]
+        self.velocity[:n, 1] += PARTICLE_GRAVITY
+        self.lifetime[:n] -= 1
+
+        # Compact the surviving particles to the front of the arrays
+        alive = self.lifetime[:n] > 0
+        survivors = int(np.count_nonzero(alive))
+        if survivors != n:
+            for array in (self.position, self.velocity, self.lifetime, self.size, self.color):
+                array[:survivors] = array[:n][alive]
+            self.count = survivors
+
+    def get_surface(self, color, width, height, fade_step):
+        key = (color, width, height, fade_step)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            if len(self.surfaces) >= MAX_CACHED_SURFACES:
+                self.surfaces.clear()
+            surface = pygame.Surface((width, height))
+            surface.fill(self.colors[color])
+            surface.set_alpha(255 * fade_step // FADE_STEPS)
+            self.surfaces[key] = surface
+        return surface
+
+    def draw(self, screen, offset):
+        n = self.count
+        if n == 0:
+            return
+        xs = (self.position[:n, 0].astype(np.int32) + offset[0]).tolist()
+        ys = (self.position[:n, 1].astype(np.int32) + offset[1]).tolist()
+        # Fade out linearly over the particle's lifetime
+        fade_steps = (-(-self.lifetime[:n].astype(np.int32) * FADE_STEPS // PARTICLE_LIFETIME)).tolist()
+        sizes = self.size[:n].tolist()
+        colors = self.color[:n].tolist()
+        screen.blits([
+            (self.get_surface(colors[i], sizes[i][0], sizes[i][1], fade_steps[i]), (xs[i], ys[i]))
+            for i in range(n)
+        ], False)
+
+    def bounds(self, offset):
+        """Return the screen rect covering every live particle, or None if there are none."""
+        n = self.count
+        if n == 0:
+            return None
+        left = int(self.position[:n, 0].min())
+        top = int(self.position[:n, 1].min())
+        right = int((self.position[:n, 0] + self.size[:n, 0]).max()) + 1
+        bottom = int((self.position[:n, 1] + self.size[:n, 1]).max()) + 1
+        return pygame.Rect(left + offset[0], top + offset[1], right - left, bottom - top)
+
+    def clear(self):
+        self.count = 0
@@ -1,36 +1,26 @@
 import pygame
+from asset_cache import load_image
+
+PROJECTILE_POOL_SIZE = 32  # Maximum number of arrows in flight at once
+ARROW_SPEED = 10
+ARROW_IMAGES = {
+    1: 'sprites/projectiles/arrow_right.png',
+    -1: 'sprites/projectiles/arrow_left.png',
+}
+
 
 class Projectile(pygame.sprite.Sprite):
     def __init__(self, image, x, y, direction, speed):
         super().__init__()
+        self.reset(image, x, y, direction, speed)
+
+    def reset(self, image, x, y, direction, speed):
         self.image = image
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
         self.direction = direction
         self.speed = speed
-        self.platforms = None
-        self.targets = None
-
-    def update(self):
-        self.rect.x += self.direction * self.speed
-
-        # check if projectile is out of bounds
-        if self.rect.x < 0 or self.rect.x > 2600:
-            self.destroy()
-
-        # check if projectile is colliding with any platforms
-        for platform in self.platforms:
-            if self.check_collision(platform):
-                self.destroy()
-
-        # Check for collisions with targets
-        for target in self.targets:
-            if self.rect.colliderect(target.rect):
-                new_platform = target.turn_into_platform()
-                self.destroy()
-                return new_platform
-        return None
 
     def draw(self, screen):
         screen.blit(self.image, self.rect)
@@ -41,8 +31,59 @@ class Projectile(pygame.sprite.Sprite):
     def destroy(self):
         self.kill()
 
-    def set_platforms(self, platforms):
-        self.platforms = platforms
 
-    def set_targets(self, targets):
-        self.targets = targets
\ No newline at end of file
+class ProjectilePool(pygame.sprite.Group):
+    """Group of live projectiles that recycles a fixed set of Projectile instances.
+
+    Projectiles are moved and hit tested here in one batch per frame rather than in Projectile.update().
+    """
+
+    def __init__(self, capacity=PROJECTILE_POOL_SIZE):
+        super().__init__()
+        self.images = {direction: load_image(path) for direction, path in ARROW_IMAGES.items()}
+        self.free = [Projectile(self.images[1], 0, 0, 1, 0) for _ in range(capacity)]
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        # Destroyed projectiles go back to the pool
+        self.free.append(sprite)
+
+    def fire(self, x, y, direction, speed=ARROW_SPEED):
+        if not self.free:
+            # Pool exhausted, recycle the oldest arrow still in flight
+            next(iter(self.spritedict)).destroy()
+        projectile = self.free.pop()
+        projectile.reset(self.images[direction], x, y, direction, speed)
+        self.add(projectile)
+        return projectile
+
+    def update(self, platforms, targets):
+        """Move every live projectile and resolve its hits, returning the platforms made from hit targets."""
+        new_platforms = []
+        live = self.sprites()
+        if not live:
+            return new_platforms
+
+        target_list = targets.sprites()
+        target_rects = [target.rect for target in target_list]
+        for projectile in live:
+            projectile.rect.x += projectile.direction * projectile.speed
+
+            # check if projectile is out of bounds
+            if projectile.rect.x < 0 or projectile.rect.x > 2600:
+                projectile.destroy()
+                continue
+
+            # Check for collisions with targets, skipping ones already hit this frame
+            hit_target = None
+            for index in projectile.rect.collidelistall(target_rects):
+                if target_list[index].alive():
+                    hit_target = target_list[index]
+                    break
+            if hit_target:
+                new_platforms.append(hit_target.turn_into_platform())
+                projectile.destroy()
+            # check if projectile is colliding with any platforms
+            elif platforms.collide(projectile.rect):
+                projectile.destroy()
+        return new_platforms
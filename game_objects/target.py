@@ -1,10 +1,11 @@
 import pygame
+from asset_cache import load_image
 from game_objects.platform import Platform
 
 class Target (pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
-        self.image = pygame.image.load('sprites/interactive/target.png').convert_alpha()
+        self.image = load_image('sprites/interactive/target.png')
         self.rect = self.image.get_rect()
 
         self.rect.x = x
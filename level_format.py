@@ -0,0 +1,218 @@
+"""Compiled binary level format.
+
+Levels are authored as JSON (edit_mode.save_level) and can be compiled into a
+packed binary file that the game memory-maps instead of parsing JSON:
+
+    header       magic, version, string count and entity counts
+    goal         x, y, width, height
+    spawn point  x, y, width, height
+    strings      decoration type names, each a u16 length and UTF-8 bytes
+    platforms    x, y, width, height, breakable
+    decorations  type index, x, y, z_index, scale
+    targets      x, y
+
+Usage:
+    python level_format.py compile levels/room1A.json [levels/room1A.lvl]
+    python level_format.py decompile levels/room1A.lvl [levels/room1A.json]
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+
+MAGIC = b'GKLV'
+VERSION = 1
+COMPILED_EXTENSION = '.lvl'
+
+HEADER = struct.Struct('<4sHHIII')  # magic, version, strings, platforms, decorations, targets
+RECT = struct.Struct('<iiii')
+STRING_LENGTH = struct.Struct('<H')
+PLATFORM = struct.Struct('<iiiiB')
+DECORATION = struct.Struct('<Hiiid')
+TARGET = struct.Struct('<ii')
+
+
+class JsonLevel:
+    """Level records read from a level dict, as loaded from the JSON authoring format."""
+
+    def __init__(self, level_data):
+        self.level_data = level_data
+        goal = level_data['goal']
+        spawn_point = level_data['spawn_point']
+        self.goal = (goal['x'], goal['y'], goal['width'], goal['height'])
+        self.spawn_point = (spawn_point['x'], spawn_point['y'], spawn_point['width'], spawn_point['height'])
+
+    def platforms(self):
+        for p in self.level_data['platforms']:
+            yield p['x'], p['y'], p['width'], p['height'], p.get('breakable', False)
+
+    def decorations(self):
+        for d in self.level_data.get('decorations', []):
+            yield d['type'], d['x'], d['y'], d.get('z_index', 0), d.get('scale', 1)
+
+    def targets(self):
+        for t in self.level_data.get('targets', []):
+            yield t['x'], t['y']
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CompiledLevel:
+    """Level records read straight out of a memory-mapped compiled level file."""
+
+    def __init__(self, filename):
+        with open(filename, 'rb') as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.mmap)
+
+        magic, version, string_count, platform_count, decoration_count, target_count = HEADER.unpack_from(self.view)
+        if magic != MAGIC:
+            raise ValueError(f'{filename} is not a compiled level')
+        if version != VERSION:
+            raise ValueError(f'{filename} has level format version {version}, expected {VERSION}')
+
+        offset = HEADER.size
+        self.goal = RECT.unpack_from(self.view, offset)
+        offset += RECT.size
+        self.spawn_point = RECT.unpack_from(self.view, offset)
+        offset += RECT.size
+
+        self.decoration_types = []
+        for _ in range(string_count):
+            (length,) = STRING_LENGTH.unpack_from(self.view, offset)
+            offset += STRING_LENGTH.size
+            self.decoration_types.append(str(self.view[offset:offset + length], 'utf-8'))
+            offset += length
+
+        self.sections = {}
+        for name, record, count in (('platforms', PLATFORM, platform_count),
+                                    ('decorations', DECORATION, decoration_count),
+                                    ('targets', TARGET, target_count)):
+            self.sections[name] = (offset, offset + record.size * count)
+            offset += record.size * count
+
+    def records(self, name, record):
+        start, end = self.sections[name]
+        section = self.view[start:end]
+        try:
+            yield from record.iter_unpack(section)
+        finally:
+            section.release()
+
+    def platforms(self):
+        for x, y, width, height, breakable in self.records('platforms', PLATFORM):
+            yield x, y, width, height, bool(breakable)
+
+    def decorations(self):
+        types = self.decoration_types
+        for type_index, x, y, z_index, scale in self.records('decorations', DECORATION):
+            yield types[type_index], x, y, z_index, scale
+
+    def targets(self):
+        return self.records('targets', TARGET)
+
+    def close(self):
+        self.view.release()
+        self.mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def compile_level(level):
+    """Pack a level (a level dict or any object with the JsonLevel record methods) into bytes."""
+    if isinstance(level, dict):
+        level = JsonLevel(level)
+    platforms = list(level.platforms())
+    decorations = list(level.decorations())
+    targets = list(level.targets())
+
+    types = []
+    for decoration in decorations:
+        if decoration[0] not in types:
+            types.append(decoration[0])
+
+    parts = [
+        HEADER.pack(MAGIC, VERSION, len(types), len(platforms), len(decorations), len(targets)),
+        RECT.pack(*level.goal),
+        RECT.pack(*level.spawn_point),
+    ]
+    for name in types:
+        encoded = name.encode('utf-8')
+        parts.append(STRING_LENGTH.pack(len(encoded)))
+        parts.append(encoded)
+    parts.extend(PLATFORM.pack(x, y, width, height, breakable) for x, y, width, height, breakable in platforms)
+    parts.extend(DECORATION.pack(types.index(name), x, y, z_index, scale) for name, x, y, z_index, scale in decorations)
+    parts.extend(TARGET.pack(x, y) for x, y in targets)
+    return b''.join(parts)
+
+
+def decompile_level(level):
+    """Convert level records back into the JSON authoring layout used by edit_mode.save_level."""
+    x, y, width, height = level.goal
+    goal = {'x': x, 'y': y, 'width': width, 'height': height}
+    x, y, width, height = level.spawn_point
+    spawn_point = {'x': x, 'y': y, 'width': width, 'height': height}
+    return {
+        'platforms': [{'x': x, 'y': y, 'width': width, 'height': height, 'breakable': breakable}
+                      for x, y, width, height, breakable in level.platforms()],
+        'goal': goal,
+        'spawn_point': spawn_point,
+        'decorations': [{'type': name, 'x': x, 'y': y, 'z_index': z_index,
+                         'scale': int(scale) if scale.is_integer() else scale}
+                        for name, x, y, z_index, scale in level.decorations()],
+        'targets': [{'x': x, 'y': y} for x, y in level.targets()],
+    }
+
+
+def compiled_path(json_path):
+    return os.path.splitext(json_path)[0] + COMPILED_EXTENSION
+
+
+def is_compiled_current(json_path):
+    """True if a compiled level exists that is at least as new as its JSON source."""
+    compiled = compiled_path(json_path)
+    if not os.path.exists(compiled):
+        return False
+    return not os.path.exists(json_path) or os.path.getmtime(compiled) >= os.path.getmtime(json_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert levels between JSON and the compiled binary format.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    compile_parser = subparsers.add_parser('compile', help='JSON level to compiled level')
+    compile_parser.add_argument('source')
+    compile_parser.add_argument('destination', nargs='?')
+    decompile_parser = subparsers.add_parser('decompile', help='compiled level to JSON level')
+    decompile_parser.add_argument('source')
+    decompile_parser.add_argument('destination', nargs='?')
+    args = parser.parse_args()
+
+    if args.command == 'compile':
+        destination = args.destination or compiled_path(args.source)
+        with open(args.source, 'r') as file:
+            data = compile_level(json.load(file))
+        with open(destination, 'wb') as file:
+            file.write(data)
+    else:
+        destination = args.destination or os.path.splitext(args.source)[0] + '.json'
+        with CompiledLevel(args.source) as level:
+            level_data = decompile_level(level)
+        with open(destination, 'w') as file:
+            json.dump(level_data, file, indent=4)
+    print(f"Wrote {destination}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+# Permissions for newly created level files, as open() would give them. The umask can
+# only be read by setting it, so that's done once here rather than from the writer thread.
+_umask = os.umask(0)
+os.umask(_umask)
+NEW_FILE_MODE = 0o666 & ~_umask
+
+
+def write_json_atomic(filename, data):
+    """Write data as JSON next to filename, then swap it into place so a crash never leaves half a file."""
+    directory = os.path.dirname(filename) or '.'
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(filename), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as file:
+            json.dump(data, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+        # mkstemp creates the file private to its owner; keep the level's own permissions instead
+        try:
+            mode = os.stat(filename).st_mode & 0o777
+        except FileNotFoundError:
+            mode = NEW_FILE_MODE
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, filename)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+class LevelWriter:
+    """Writes level files on a background thread.
+
+    Saving a level that is still waiting to be written replaces the queued data
+    instead of queueing a second write, so bursts of saves cost one write each.
+    Until a level has been written, latest(filename) returns the queued data so
+    readers never see the stale file.
+    """
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='level-writer')
+        self.lock = threading.Lock()
+        self.pending = {}  # filename -> newest level data not yet on disk
+        self.queued = set()  # filenames with a write job that hasn't started yet
+
+    def save(self, filename, level_data):
+        with self.lock:
+            self.pending[filename] = level_data
+            if filename in self.queued:
+                return
+            self.queued.add(filename)
+        self.executor.submit(self.write, filename)
+
+    def write(self, filename):
+        with self.lock:
+            self.queued.discard(filename)
+            level_data = self.pending.get(filename)
+        if level_data is None:
+            return
+        try:
+            write_json_atomic(filename, level_data)
+        except OSError as e:
+            print(f"Could not save {filename}: {e}")
+            return
+        except Exception:
+            # Anything else is a bug, e.g. level data json can't encode; report it rather
+            # than leaving it in a future nobody reads
+            print(f"Could not save {filename}:")
+            traceback.print_exc()
+            return
+        with self.lock:
+            # Keep newer data that arrived while this write was running
+            if self.pending.get(filename) is level_data:
+                del self.pending[filename]
+
+    def latest(self, filename):
+        """Return level data saved for filename but not yet written, or None."""
+        with self.lock:
+            return self.pending.get(filename)
+
+    def flush(self):
+        """Block until every queued write has finished."""
+        self.executor.submit(lambda: None).result()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
@@ -3,26 +3,27 @@ import pygame
 import sys
 import json
 import os
-import re
-import random as rnd
-from player import Player
+from player import Player, load_player_frames
 from camera import Camera
 from game_objects.platform import Platform
 from game_objects.goal import Goal
 from game_objects.decoration import Decoration
 from game_objects.spawn_point import SpawnPoint
-from game_objects.projectile import Projectile
+from game_objects.projectile import ProjectilePool
 from game_objects.target import Target
-from game_objects.particle import Particle
+from game_objects.particle import ParticleSystem
+import bootstrap
+from audio_manager import FootstepScheduler
 from menu import main_menu  # Import the menu
-from audio_manager import AudioManager
-
-# Initialize Pygame
-pygame.init()
-
-# initialize audio manager
-audio_manager = AudioManager()
-audio_manager.load_sound('walk', 'audio/sounds/walking.wav')
+from asset_cache import load_image
+from decoration_registry import decoration_types
+from text_cache import render_text
+from spatial_grid import SpatialGroup
+from renderer import ParallaxLayers, Renderer, StaticChunkGroup, ZOrderedGroup, presenter
+from room_manager import Room, RoomManager
+from level_format import CompiledLevel, JsonLevel, compiled_path, is_compiled_current
+from timestep import FixedTimestep, Interpolator, RENDER_CAPS
+from profiler import profiler
 
 # Screen dimensions (scaled up)
 SCREEN_WIDTH = 1300
@@ -35,28 +36,58 @@ END_COLOR = (255, 255, 255)
 
 # Initialize current room
 CURRENT_ROOM = 'room1A'
-
-# Initialize screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Platformer")
+LEVELS_DIR = 'levels'
+GAME_MUSIC = 'audio/music/Medieval-rock.mp3'
 
 # Clock for controlling frame rate
 clock = pygame.time.Clock()
 
-# Load all decoration types
-DECORATION_TYPES = {
-    name.split('.')[0]: pygame.image.load(os.path.join('sprites/decorations', name)).convert_alpha()
-    for name in os.listdir('sprites/decorations')
-    if name.endswith('.png')
-}
+# Set by bootstrap.start()
+screen = None
+
+@bootstrap.core_asset
+def load_game_screen():
+    global screen
+    screen = bootstrap.screen
 
 def draw_gradient(screen, start_color, end_color):
-    for y in range(SCREEN_HEIGHT):
+    width, height = screen.get_size()
+    for y in range(height):
         color = [
-            start_color[i] + (end_color[i] - start_color[i]) * y // SCREEN_HEIGHT
+            start_color[i] + (end_color[i] - start_color[i]) * y // height
             for i in range(3)
         ]
-        pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+        pygame.draw.line(screen, color, (0, y), (width, y))
+
+# Cached sky gradient with the background image composited on top
+background_layer = None
+background_layer_key = None
+
+def get_background_layer(start_color, end_color, size):
+    """Return the static background, re-rendering it only when the colors or window size change."""
+    global background_layer, background_layer_key
+    key = (start_color, end_color, size)
+    if key != background_layer_key:
+        layer = pygame.Surface(size)
+        draw_gradient(layer, start_color, end_color)
+        background = load_image('backgrounds/glasgow_uni.png')
+        background = load_image('backgrounds/glasgow_uni.png', (size[0], background.get_height()))
+        background_rect = background.get_rect()
+        background_rect.bottom = size[1]
+        layer.blit(background, background_rect.topleft)
+        background_layer = layer.convert()
+        background_layer_key = key
+    return background_layer
+
+@bootstrap.deferred_asset
+def load_game_assets():
+    """Everything the game needs but the menu doesn't, loaded while the menu is showing."""
+    # One walking voice at a time; the footstep scheduler restarts it as the player walks
+    bootstrap.audio_manager.load_sound('walk', 'audio/sounds/walking.wav', max_voices=1)
+    # Decode the game music while the menu plays so leaving it can crossfade straight away
+    bootstrap.audio_manager.preload_music(GAME_MUSIC)
+    load_player_frames()
+    get_background_layer(START_COLOR, END_COLOR, screen.get_size())
 
 def load_level(filename):
     try:
@@ -74,20 +105,6 @@ def load_level(filename):
             'targets': []
         }
 
-def increment_room(room_name):
-    match = re.match(r'room(\d+)([A-Za-z])', room_name)
-    if match:
-        room_number = int(match.group(1))
-        room_letter = match.group(2)
-        return f'room{room_number + 1}{room_letter}'
-    return room_name
-
-def swap_room_letter(room_name):
-    match = re.match(r'room(\d+)([A-Za-z])', room_name)
-    if match:
-        return f'room{match.group(1)}B' if match.group(2) == 'A' else f'room{match.group(1)}A'
-    return room_name
-
 def reset_player_and_camera(player, camera, spawn_point, position=None):
     """Reset the player and camera to the starting position."""
     if position:
@@ -98,83 +115,110 @@ def reset_player_and_camera(player, camera, spawn_point, position=None):
     camera.camera.x = 0
     camera.camera.y = 0
 
-def switch_game_state(player, camera, all_sprites, platforms):
+def switch_game_state(player, camera, rooms, projectiles):
     global CURRENT_ROOM
-    CURRENT_ROOM = swap_room_letter(CURRENT_ROOM)
-    level_data = load_level(f'levels/{CURRENT_ROOM}.json')
+    # The other variant is already resident, so switching doesn't touch the disk
+    old_room = rooms.current
+    room = rooms.switch_variant()
+    CURRENT_ROOM = room.name
     # store player position
     player_position = (player.rect.x, player.rect.y)
-    all_sprites.empty()
-    platforms.empty()
-    all_sprites, platforms, new_goal, spawn_point, targets = load_room(level_data)
-    reset_player_and_camera(player, camera, spawn_point, player_position)
-    player.set_platforms(platforms)
+    # The room stays resident for swapping back, so only take out what moves between rooms
+    old_room.all_sprites.remove(player, *projectiles)
+    reset_player_and_camera(player, camera, room.spawn_point, player_position)
+    player.set_platforms(room.platforms)
     player.z_index = 0
     # switching player state
     player.switch_player_state()
-    all_sprites.add(player)
-    return new_goal, all_sprites, platforms, spawn_point, targets
+    room.all_sprites.add(player)
+    return room
 
-def next_level(player, camera, all_sprites, platforms):
+def next_level(player, camera, rooms):
     global CURRENT_ROOM
-    CURRENT_ROOM = increment_room(CURRENT_ROOM)
-    level_data = load_level(f'levels/{CURRENT_ROOM}.json')
-    all_sprites.empty()
-    platforms.empty()
-    all_sprites, platforms, new_goal, spawn_point, targets = load_room(level_data)
-    reset_player_and_camera(player, camera, spawn_point)
+    old_room = rooms.current
+    room = rooms.advance()
+    CURRENT_ROOM = room.name
+    old_room.all_sprites.empty()
+    reset_player_and_camera(player, camera, room.spawn_point)
     player.z_index = 0
-    all_sprites.add(player)
-    return new_goal, all_sprites, platforms, spawn_point
-
-def load_room(level_data):
-    all_sprites = pygame.sprite.Group()
-    platforms = pygame.sprite.Group()
-    targets = pygame.sprite.Group()
-
-    for platform_data in level_data['platforms']:
-        platform = Platform(platform_data['x'], platform_data['y'], platform_data['width'], platform_data['height'], platform_data.get('breakable', False))
+    room.all_sprites.add(player)
+    return room
+
+def open_level(filename):
+    """Open a level's records, preferring an up to date compiled copy over the JSON."""
+    if is_compiled_current(filename):
+        return CompiledLevel(compiled_path(filename))
+    return JsonLevel(load_level(filename))
+
+def build_room(room_name):
+    """Load, construct and bake a room; runs on the room manager's worker thread.
+
+    The room comes back ready to draw, so swapping to it costs the main thread nothing.
+    """
+    with open_level(os.path.join(LEVELS_DIR, f'{room_name}.json')) as level:
+        return Room(room_name, *load_room(level))
+
+def load_room(level):
+    """Build a room's sprite groups from level records (a JsonLevel or CompiledLevel)."""
+    # all_sprites keeps itself in z order so rendering never has to sort
+    all_sprites = ZOrderedGroup()
+    # Scenery that never moves is baked into chunks instead of being drawn one by one
+    static_sprites = StaticChunkGroup()
+    # Platforms and targets are indexed in a spatial grid for collision queries
+    platforms = SpatialGroup()
+    targets = SpatialGroup()
+    # Decorations that scroll with parallax are composited into one strip per z_index
+    parallax = ParallaxLayers()
+
+    for x, y, width, height, breakable in level.platforms():
+        platform = Platform(x, y, width, height, breakable)
         platform.z_index = 0
         platforms.add(platform)
-        all_sprites.add(platform)
-    for decoration_data in level_data.get('decorations', []):
-        decoration = Decoration(
-            DECORATION_TYPES[decoration_data['type']],
-            decoration_data['x'],
-            decoration_data['y'],
-            decoration_data.get('z_index', 0),
-            decoration_data.get('scale', 1)
-        )
-        all_sprites.add(decoration)
-    for target_data in level_data.get('targets', []):
-        target = Target(target_data['x'], target_data['y'])
+        static_sprites.add(platform)
+    # Decoration images are decoded on first use; rooms are built ahead on the room
+    # manager's thread, so the next room's types are ready before the player gets there
+    for decoration_type, x, y, z_index, scale in level.decorations():
+        decoration = Decoration(decoration_types[decoration_type], x, y, z_index, scale, decoration_type)
+        if decoration.z_index == 0:
+            static_sprites.add(decoration)
+        elif parallax.accepts(decoration):
+            parallax.add(decoration)
+        else:
+            all_sprites.add(decoration)
+    parallax.bake()
+    all_sprites.add(*parallax.bands.values())
+    # Draw the static chunks before the targets, player and projectiles at z_index 0
+    all_sprites.add(static_sprites.layer_marker)
+    for x, y in level.targets():
+        target = Target(x, y)
         target.z_index = 0
         targets.add(target)
         all_sprites.add(target)
 
-    goal = Goal(**level_data['goal'])
+    goal = Goal(*level.goal)
     goal.z_index = 0
-    all_sprites.add(goal)
-    spawn_point = SpawnPoint(**level_data['spawn_point'])
+    static_sprites.add(goal)
+    spawn_point = SpawnPoint(*level.spawn_point)
     spawn_point.z_index = 0
-    all_sprites.add(spawn_point)
-    return all_sprites, platforms, goal, spawn_point, targets
+    static_sprites.add(spawn_point)
+    # Bake now rather than on the room's first frame
+    static_sprites.bake_dirty()
+    return all_sprites, static_sprites, parallax, platforms, goal, spawn_point, targets
 
 def pause_menu():
-    font = pygame.font.Font(None, 35)
-    text = font.render("Paused", True, WHITE)
+    text = render_text("Paused", 35, WHITE)
     text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
-    resume_text = font.render("Press ESC to Resume", True, WHITE)
+    resume_text = render_text("Press ESC to Resume", 35, WHITE)
     resume_rect = resume_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-    quit_text = font.render("Press Q to Quit", True, WHITE)
+    quit_text = render_text("Press Q to Quit", 35, WHITE)
     quit_rect = quit_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
-    main_menu_text = font.render("Press SPACE to go to Main Menu", True, WHITE)
+    main_menu_text = render_text("Press SPACE to go to Main Menu", 35, WHITE)
     main_menu_rect = main_menu_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 100))
 
     # small controls text.
-    controls_text = font.render(" Controls: WASD to move, P to attack, R to reset, Enter to switch between environments.", True, WHITE)
+    controls_text = render_text(" Controls: WASD to move, P to attack, R to reset, Enter to switch between environments.", 35, WHITE)
     controls_rect = controls_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 150))
-    explanation_text = font.render("Your attack changes when you switch environments. hit r if you get stuck.", True, WHITE)
+    explanation_text = render_text("Your attack changes when you switch environments. hit r if you get stuck.", 35, WHITE)
     explanation_rect = explanation_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 200))
     
     screen.fill((0, 0, 0))  # Dark background
@@ -184,7 +228,7 @@ def pause_menu():
     screen.blit(main_menu_text, main_menu_rect)
     screen.blit(controls_text, controls_rect)
     screen.blit(explanation_text, explanation_rect)
-    pygame.display.flip()
+    presenter.present()
     if pygame.key.get_pressed()[pygame.K_q]:
         pygame.quit()
         sys.exit()
@@ -192,191 +236,197 @@ def pause_menu():
 
 
 def winning_screen():
-    font = pygame.font.Font(None, 35)
-    text = font.render("You Win!", True, WHITE)
+    text = render_text("You Win!", 35, WHITE)
     text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
     screen.fill((0, 0, 0))  # Dark background
     screen.blit(text, text_rect)
-    pygame.display.flip()
+    presenter.invalidate()
+    presenter.present()
     pygame.time.wait(3000)
 
 
 def main():
+    run_game()
+    pygame.quit()
+    sys.exit()
+
+def run_game(fps=60, on_frame=None):
+    """Run the game loop until the window closes or the game is won.
+
+    The simulation steps at a fixed TICK_RATE while frames render at up to fps
+    (0 runs uncapped; F cycles through RENDER_CAPS in game), drawing moving sprites
+    interpolated between the last two ticks. F3 toggles the profiler overlay and
+    F4 exports the recorded phase timings as a Chrome trace. on_frame, if given, is
+    called at the start of every frame and stops the loop by returning False; the
+    benchmark uses it to inject scripted input and time frames.
+    """
     global CURRENT_ROOM
-    background = pygame.image.load('backgrounds/glasgow_uni.png').convert_alpha()
-    background = pygame.transform.scale(background, (SCREEN_WIDTH, background.get_height()))
-    background_rect = background.get_rect()
-    background_rect.bottom = SCREEN_HEIGHT
-    level_data = load_level(f'levels/{CURRENT_ROOM}.json')
-    all_sprites, platforms, goal, spawn_point, targets = load_room(level_data)
-    projectiles = pygame.sprite.Group()
+    # Normally done by the menu; here for when the game loop is started directly
+    bootstrap.start()
+    bootstrap.load_deferred()
+    rooms = RoomManager(build_room)
+    room = rooms.enter(CURRENT_ROOM)
+    projectiles = ProjectilePool()
+    particles = ParticleSystem()
     player = Player()
-    reset_player_and_camera(player, Camera(SCREEN_WIDTH, SCREEN_HEIGHT), spawn_point)
-    player.set_platforms(platforms)
-    all_sprites.add(player)
+    reset_player_and_camera(player, Camera(SCREEN_WIDTH, SCREEN_HEIGHT), room.spawn_point)
+    player.set_platforms(room.platforms)
+    room.all_sprites.add(player)
     camera = Camera(SCREEN_WIDTH, SCREEN_HEIGHT)
+    renderer = Renderer(screen)
+    timestep = FixedTimestep()
+    interpolator = Interpolator()
+    footsteps = FootstepScheduler(bootstrap.audio_manager)
     running = True
     paused = False
     game_won = False
+    clock.tick()
 
     while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_a:
-                    player.go_left()
-                    if player.on_ground:
-                        audio_manager.play_sound('walk')
-                    else:
-                        audio_manager.stop_sound('walk')
-                elif event.key == pygame.K_d:
-                    player.go_right()
-                    if player.on_ground:
-                        audio_manager.play_sound('walk')
-                    else:
-                        audio_manager.stop_sound('walk')
-                elif event.key == pygame.K_w:
-                    player.jump()
-                elif event.key == pygame.K_RETURN:
-                    goal, all_sprites, platforms, spawn_point, targets = switch_game_state(player, camera, all_sprites, platforms)
-                    player.set_platforms(platforms)
-                    print(f"Moving to {CURRENT_ROOM}")
-                elif event.key == pygame.K_r:
-                    reset_player_and_camera(player, camera, spawn_point)
-                    print(f"Resting {CURRENT_ROOM}")
-                elif event.key == pygame.K_ESCAPE and not paused:
-                    paused = not paused
-                elif event.key == pygame.K_p:
-                    player.attack()
-                    # check if player is colliding with breakable platform if so break it
-                    attack_rect = player.rect.inflate(20,10)  # Expand collision area by 20 pixels width, 10 pixels height
-                    if player.player_state:
-                        if player.last_direction_faced == 'right':
-                            # create a projectile from the player towards the right
-                            projectile = Projectile(pygame.image.load('sprites/projectiles/arrow_right.png').convert_alpha(), player.rect.x, player.rect.y + 50, 1, 10)
-                            projectile.set_platforms(platforms)
-                            projectile.set_targets(targets)
-                            projectiles.add(projectile)
-                        elif player.last_direction_faced == 'left':
-                            # create a projectile from the player towards the left
-                            projectile = Projectile(pygame.image.load('sprites/projectiles/arrow_left.png').convert_alpha(), player.rect.x, player.rect.y + 50, -1, 10)
-                            projectile.set_platforms(platforms)
-                            projectile.set_targets(targets)
-                            projectiles.add(projectile)
-                    else:
-                        for platform in platforms:
-                            if attack_rect.colliderect(platform.rect):
+        profiler.end_frame()
+        if on_frame and on_frame() is False:
+            break
+        profiler.begin_frame()
+        with profiler.phase('wait'):
+            frame_ms = clock.tick(fps)
+        bootstrap.audio_manager.update()
+        with profiler.phase('events'):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_a:
+                        player.go_left()
+                    elif event.key == pygame.K_d:
+                        player.go_right()
+                    elif event.key == pygame.K_w:
+                        player.jump()
+                    elif event.key == pygame.K_RETURN:
+                        room = switch_game_state(player, camera, rooms, projectiles)
+                        particles.clear()
+                        room.all_sprites.add(projectiles)
+                        interpolator.snapshot([player])
+                        print(f"Moving to {CURRENT_ROOM}")
+                    elif event.key == pygame.K_r:
+                        reset_player_and_camera(player, camera, room.spawn_point)
+                        interpolator.snapshot([player])
+                        print(f"Resting {CURRENT_ROOM}")
+                    elif event.key == pygame.K_f:
+                        fps = RENDER_CAPS[(RENDER_CAPS.index(fps) + 1) % len(RENDER_CAPS)] if fps in RENDER_CAPS else RENDER_CAPS[0]
+                        print(f"Render cap: {fps or 'uncapped'}")
+                    elif event.key == pygame.K_F3:
+                        profiler.toggle_overlay()
+                        presenter.invalidate()
+                    elif event.key == pygame.K_F4:
+                        print(f"Wrote {profiler.export_chrome_trace()}")
+                    elif event.key == pygame.K_ESCAPE and not paused:
+                        paused = not paused
+                        presenter.invalidate()
+                    elif event.key == pygame.K_p:
+                        player.attack()
+                        # check if player is colliding with breakable platform if so break it
+                        attack_rect = player.rect.inflate(20,10)  # Expand collision area by 20 pixels width, 10 pixels height
+                        if player.player_state:
+                            if player.last_direction_faced == 'right':
+                                # create a projectile from the player towards the right
+                                projectile = projectiles.fire(player.rect.x, player.rect.y + 50, 1)
+                                interpolator.place(projectile)
+                                room.all_sprites.add(projectile)
+                            elif player.last_direction_faced == 'left':
+                                # create a projectile from the player towards the left
+                                projectile = projectiles.fire(player.rect.x, player.rect.y + 50, -1)
+                                interpolator.place(projectile)
+                                room.all_sprites.add(projectile)
+                        else:
+                            for platform in room.platforms.collide(attack_rect):
                                 if platform.broken():
-                                    platforms.remove(platform)
-                                    all_sprites.remove(platform)
-                                    player.set_platforms(platforms)
-
                                     # add three small brown particles
-                                    for i in range(3):  # Create 5 particles instead of 3
-                                        particle = Particle(
-                                            color=(139, 69, 19),  # Brown color
-                                            x=platform.rect.centerx + rnd.randint(-10, 10),
-                                            # Spread particles around
-                                            y=platform.rect.centery + rnd.randint(-10, 10),
-                                            width=rnd.randint(10, 20),  # Random sizes
-                                            height=rnd.randint(10, 15),
-                                            dx=rnd.uniform(-3, 3),  # Random horizontal velocity
-                                            dy=rnd.uniform(-8, -4)  # Initial upward velocity
-                                        )
-                                        all_sprites.add(particle)
-
-                                    # set all platforms of projectiles
-                                    for sprite in all_sprites:
-                                        if isinstance(sprite, Projectile):
-                                            sprite.set_platforms(platforms)
-
-            elif event.type == pygame.USEREVENT + 1:  # Custom attack animation timer
-                player.attacking = False
-
-            elif event.type == pygame.KEYUP:
-                if event.key in [pygame.K_a, pygame.K_d]:
-                    player.stop()
-                    audio_manager.stop_sound('walk')
-
-        # Check for collisions between projectiles and targets
-        for projectile in projectiles:
-            if isinstance(projectile, Projectile):
-                new_platform = projectile.update()
-                if new_platform:
-                    platforms.add(new_platform)
-                    all_sprites.add(new_platform)
-                    # make some particles when a platform is created white color
-                    for i in range(3):  # Create 5 particles instead of 3
-                        particle = Particle(
-                            color=(255, 255, 255),  # White color
-                            x=new_platform.rect.centerx + rnd.randint(-10, 10),
-                            # Spread particles around
-                            y=new_platform.rect.centery + rnd.randint(-10, 10),
-                            width=rnd.randint(10, 20),  # Random sizes
-                            height=rnd.randint(10, 15),
-                            dx=rnd.uniform(-3, 3),  # Random horizontal velocity
-                            dy=rnd.uniform(-8, -4)  # Initial upward velocity
-                        )
-                        all_sprites.add(particle)
+                                    particles.burst((139, 69, 19), platform.rect.center)
 
+                elif event.type == pygame.USEREVENT + 1:  # Custom attack animation timer
+                    player.attacking = False
+
+                elif event.type == pygame.KEYUP:
+                    if event.key in [pygame.K_a, pygame.K_d]:
+                        player.stop()
 
         if paused:
             pause_menu()
             for event in pygame.event.get():
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                     paused = False
+                    presenter.invalidate()
                 elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
                     paused=False
                     main_menu()
+                    presenter.invalidate()
+            # Time spent paused is not simulated
+            timestep.reset()
             continue
 
         if game_won:
             winning_screen()
             break
 
-        # Update all sprites
-        all_sprites.update()
-
-        if pygame.sprite.collide_rect(player, goal):
-            goal, all_sprites, platforms, spawn_point = next_level(player, camera, all_sprites, platforms)
-            player.set_platforms(platforms)
-            print(f"Moving to {CURRENT_ROOM}")
-            # if current room is higher than 3 then player wins
-            if int(CURRENT_ROOM[4]) > 3:
-                game_won = True
-
-        camera.update(player)
-        draw_gradient(screen, START_COLOR, END_COLOR)
-        screen.blit(background, background_rect.topleft)
-
-        # adding text in top left corner to explain pause menu is escape
-        font = pygame.font.Font(None, 25)
-        text = font.render("Press ESC to Pause and find controls.", True, WHITE)
-        screen.blit(text, (10, 10))
-
-        sorted_sprites = sorted(all_sprites.sprites() + projectiles.sprites(), key=lambda sprite: getattr(sprite, 'z_index', 0))
-
-        for sprite in sorted_sprites:
-            if isinstance(sprite, Decoration):
-                # Apply parallax effect based on z_index
-                if sprite.z_index >= 10:
-                    parallax_factor = -0.1  # Foreground moves
-                    sprite.rect.x = sprite.original_x - camera.camera.x * parallax_factor
-                elif sprite.z_index <= -10:
-                    parallax_factor = 0.1  # Background moves faster
-                    sprite.rect.x = sprite.original_x - camera.camera.x * parallax_factor
-            screen.blit(sprite.image, camera.apply(sprite))
-        pygame.display.flip()
-        clock.tick(60)
-    pygame.quit()
-    sys.exit()
+        ticks = timestep.advance(frame_ms)
+        for _ in range(ticks):
+            interpolator.snapshot([player, *projectiles])
+
+            # Move projectiles and check their collisions with platforms and targets
+            with profiler.phase('projectiles'):
+                for new_platform in projectiles.update(room.platforms, room.targets):
+                    room.platforms.add(new_platform)
+                    room.static_sprites.add(new_platform)
+                    # make some particles when a platform is created white color
+                    particles.burst((255, 255, 255), new_platform.rect.center)
+
+            # Update all sprites
+            with profiler.phase('sprites'):
+                room.all_sprites.update()
+            footsteps.update(player)
+            with profiler.phase('particles'):
+                particles.update()
+
+            with profiler.phase('goal'):
+                reached_goal = pygame.sprite.collide_rect(player, room.goal)
+            if reached_goal:
+                room = next_level(player, camera, rooms)
+                particles.clear()
+                room.all_sprites.add(projectiles)
+                player.set_platforms(room.platforms)
+                interpolator.snapshot([player])
+                print(f"Moving to {CURRENT_ROOM}")
+                # if current room is higher than 3 then player wins
+                if int(CURRENT_ROOM[4]) > 3:
+                    game_won = True
+                    break
+
+        with profiler.phase('background'):
+            screen.blit(get_background_layer(START_COLOR, END_COLOR, screen.get_size()), (0, 0))
+
+            # adding text in top left corner to explain pause menu is escape
+            screen.blit(render_text("Press ESC to Pause and find controls.", 25, WHITE), (10, 10))
+
+        with profiler.phase('world'), interpolator.apply([player, *projectiles], timestep.alpha):
+            camera.update(player)
+            room.parallax.scroll(camera)
+            renderer.draw_world(room.all_sprites.ordered(), room.static_sprites, camera, particles)
+
+        with profiler.phase('overlay'):
+            overlay_rect = profiler.draw_overlay(screen, (('drawn', renderer.drawn), ('culled', renderer.culled),
+                                                          ('chunks', renderer.chunks_drawn), ('ticks', ticks)))
+        if overlay_rect:
+            presenter.mark(overlay_rect)
+        with profiler.phase('present'):
+            presenter.present()
+    rooms.close()
 
 if __name__ == '__main__':
+    bootstrap.start()
     # Show the main menu before starting the game
     main_menu()
-    audio_manager.stop_music()
-    audio_manager.load_music('audio/music/Medieval-rock.mp3')
-    audio_manager.play_music(loops=-1)
+    # In case the menu was left before its deferred assets had a chance to load
+    bootstrap.load_deferred()
+    bootstrap.audio_manager.queue_music(GAME_MUSIC)
     # Start the game loop
     main()
\ No newline at end of file
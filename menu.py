@@ -1,6 +1,8 @@
 import pygame
 import sys
-from audio_manager import AudioManager
+import bootstrap
+from renderer import presenter
+from text_cache import render_text
 
 # Screen dimensions
 SCREEN_WIDTH = 1300
@@ -10,51 +12,60 @@ SCREEN_HEIGHT = 600
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 
-# Initialize Pygame
-pygame.init()
-
 # Fonts
-font = pygame.font.Font(None, 74)
+FONT_SIZE = 74
 
-# Screen setup
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Platformer Menu")
+# Music
+MENU_MUSIC = 'audio/music/Monty-Python.mp3'
 
 # Clock for controlling frame rate
 clock = pygame.time.Clock()
 
-# Load menu background
-menu_background = pygame.image.load('backgrounds/menu_bg.png').convert_alpha()
-menu_background = pygame.transform.scale(menu_background, (SCREEN_WIDTH, SCREEN_HEIGHT))
-
-# Initialize AudioManager
-audio_manager = AudioManager()
-audio_manager.load_music('audio/music/Monty-Python.mp3')
-audio_manager.play_music()
-
-# Load mute button images
-mute_button_image = pygame.image.load('sprites/menu/mute_button.png').convert_alpha()
-mute_button_selected_image = pygame.image.load('sprites/menu/mute_selected_button.png').convert_alpha()
-mute_button_image = pygame.transform.scale(mute_button_image, (50, 50))
-mute_button_selected_image = pygame.transform.scale(mute_button_selected_image, (50, 50))
+# Set by load_menu_assets during startup
+screen = None
+menu_background = None
+mute_button_image = None
+mute_button_selected_image = None
 
 # Mute state
 is_muted = False
 
-def draw_text(text, font, color, surface, x, y):
+@bootstrap.core_asset
+def load_menu_assets():
+    global screen, menu_background, mute_button_image, mute_button_selected_image
+    screen = bootstrap.screen
+
+    # Load menu background
+    menu_background = pygame.image.load('backgrounds/menu_bg.png').convert_alpha()
+    menu_background = pygame.transform.scale(menu_background, (SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    # Load mute button images
+    mute_button_image = pygame.image.load('sprites/menu/mute_button.png').convert_alpha()
+    mute_button_selected_image = pygame.image.load('sprites/menu/mute_selected_button.png').convert_alpha()
+    mute_button_image = pygame.transform.scale(mute_button_image, (50, 50))
+    mute_button_selected_image = pygame.transform.scale(mute_button_selected_image, (50, 50))
+
+@bootstrap.deferred_asset
+def preload_menu_music():
+    # Decodes in the background; main_menu() starts it
+    bootstrap.audio_manager.preload_music(MENU_MUSIC)
+
+def draw_text(text, font_size, color, surface, x, y):
     """Helper function to draw text on the screen."""
-    text_obj = font.render(text, True, color)
+    text_obj = render_text(text, font_size, color)
     text_rect = text_obj.get_rect(center=(x, y))
     surface.blit(text_obj, text_rect)
 
 def credits_screen():
     """Credits screen loop."""
+    # The credits never change, so only the first frame needs presenting
+    presenter.invalidate()
     while True:
         screen.blit(menu_background, (0, 0))
-        draw_text("Credits", font, BLACK, screen, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4)
-        draw_text("Game developed by Fraser Levack, Kai, Rem & Tough", font, WHITE, screen, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-        draw_text("Score by @Rosenrot on Newgrounds", font, WHITE, screen, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 100)
-        draw_text("Press ESC to return to the main menu", font, WHITE, screen, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 1.2)
+        draw_text("Credits", FONT_SIZE, BLACK, screen, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4)
+        draw_text("Game developed by Fraser Levack, Kai, Rem & Tough", FONT_SIZE, WHITE, screen, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        draw_text("Score by @Rosenrot on Newgrounds", FONT_SIZE, WHITE, screen, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 100)
+        draw_text("Press ESC to return to the main menu", FONT_SIZE, WHITE, screen, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 1.2)
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -63,12 +74,14 @@ def credits_screen():
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 return  # Return to the main menu
 
-        pygame.display.flip()
+        presenter.present()
+        bootstrap.audio_manager.update()
         clock.tick(60)
 
 def main_menu():
     """Main menu loop."""
     global is_muted
+    bootstrap.start()
 
     start_button_image = pygame.image.load('sprites/menu/start_button.png').convert_alpha()
     start_button_selected_image = pygame.image.load('sprites/menu/start_selected_button.png').convert_alpha()
@@ -84,11 +97,14 @@ def main_menu():
     credits_button_image = pygame.transform.scale(credits_button_image, (200, 100))
     credits_button_selected_image = pygame.transform.scale(credits_button_selected_image, (200, 100))
 
+    presenter.invalidate()
+    last_hovered = None
+    first_frame = True
     while True:
         screen.blit(menu_background, (0, 0))
 
         # Draw title
-        draw_text("Glasgow Knight", font, BLACK, screen, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 8)
+        draw_text("Glasgow Knight", FONT_SIZE, BLACK, screen, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 8)
 
         # Draw buttons
         mouse_pos = pygame.mouse.get_pos()
@@ -118,6 +134,13 @@ def main_menu():
         else:
             screen.blit(mute_button_image, mute_button.topleft)
 
+        # Only the buttons whose hover state changed need presenting
+        buttons = (start_button, credits_button, quit_button, mute_button)
+        hovered = [button.collidepoint(mouse_pos) for button in buttons]
+        if last_hovered is not None:
+            presenter.mark(*[button for button, now, before in zip(buttons, hovered, last_hovered) if now != before])
+        last_hovered = hovered
+
         # Event handling
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -128,14 +151,23 @@ def main_menu():
                     return  # Exit the menu and start the game
                 if credits_button.collidepoint(mouse_pos):
                     credits_screen()  # Go to the credits screen
+                    presenter.invalidate()
                 if quit_button.collidepoint(mouse_pos):
                     pygame.quit()
                     sys.exit()
                 if mute_button.collidepoint(mouse_pos):
                     is_muted = not is_muted
-                    audio_manager.set_music_volume(0 if is_muted else 1)
-
-        pygame.display.flip()
+                    bootstrap.audio_manager.set_music_volume(0 if is_muted else 1)
+
+        presenter.present()
+        if first_frame:
+            # Anything not needed for the menu loads once the first frame is on screen
+            bootstrap.load_deferred()
+            # The menu theme plays at startup; opened from the pause menu, the game music carries on
+            if not bootstrap.audio_manager.has_music():
+                bootstrap.audio_manager.queue_music(MENU_MUSIC)
+            first_frame = False
+        bootstrap.audio_manager.update()
         clock.tick(60)
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 import pygame
+from asset_cache import load_image
 
-# Player settings
+# Player settings (speeds and forces are per simulation tick, see timestep.TICK_RATE)
 PLAYER_WIDTH = 55
 PLAYER_HEIGHT = 100
 PLAYER_COLOR = (0, 128, 255)
@@ -11,12 +12,46 @@ ACCELERATION = 0.6
 MAX_SPEED = 6
 ANIMATION_SPEED = 150  # Time between frame changes in milliseconds
 
+# Indices into the player's frame table
+FRAME_IDLE = 0
+FRAME_WALK_LEFT_1 = 1
+FRAME_WALK_LEFT_2 = 2
+FRAME_WALK_RIGHT_1 = 3
+FRAME_WALK_RIGHT_2 = 4
+FRAME_FALL = 5
+FRAME_ATTACK_A_LEFT = 6
+FRAME_ATTACK_A_RIGHT = 7
+FRAME_ATTACK_B = 8
+
+# Source file and horizontal flip for each frame, in frame index order.
+# The left facing walk and attack frames are exact mirrors of the right facing ones.
+FRAME_SOURCES = [
+    ('sprites/player/player.png', False),
+    ('sprites/player/player_right1.png', True),
+    ('sprites/player/player_right2.png', True),
+    ('sprites/player/player_right1.png', False),
+    ('sprites/player/player_right2.png', False),
+    ('sprites/player/player_fall.png', False),
+    ('sprites/player/player_attackA_right.png', True),
+    ('sprites/player/player_attackA_right.png', False),
+    ('sprites/player/player_attackB.png', False),
+]
+
+
+def load_player_frames():
+    """Decode, scale and mirror every player frame once."""
+    return [
+        load_image(path, (PLAYER_WIDTH, PLAYER_HEIGHT), (flip_x, False))
+        for path, flip_x in FRAME_SOURCES
+    ]
+
 
 class Player(pygame.sprite.Sprite):
     def __init__(self):
         super().__init__()
-        self.image = pygame.image.load('sprites/player/player.png').convert_alpha()
-        self.image = pygame.transform.scale(self.image, (PLAYER_WIDTH, PLAYER_HEIGHT))
+        self.frames = load_player_frames()
+        self.frame_index = FRAME_IDLE
+        self.image = self.frames[FRAME_IDLE]
         self.rect = self.image.get_rect()
         self.rect.x = 0
         self.rect.y = 0
@@ -44,12 +79,12 @@ class Player(pygame.sprite.Sprite):
                 self.last_frame_update = current_time
                 # Update the walking animation frame
                 if self.acceleration < 0:  # Moving left
-                    self.set_player_image(f'sprites/player/player_left{self.walking_frame}.png')
+                    self.set_frame(FRAME_WALK_LEFT_1 + self.walking_frame - 1)
                 else:  # Moving right
-                    self.set_player_image(f'sprites/player/player_right{self.walking_frame}.png')
+                    self.set_frame(FRAME_WALK_RIGHT_1 + self.walking_frame - 1)
 
         # Check for collision with platforms
-        platform_hit_list = pygame.sprite.spritecollide(self, self.platforms, False)
+        platform_hit_list = self.platforms.collide(self.rect)
         for platform in platform_hit_list:
             if self.change_x > 0:
                 self.rect.right = platform.rect.left
@@ -59,7 +94,7 @@ class Player(pygame.sprite.Sprite):
         self.rect.y += self.change_y
 
         # Check for collision with platforms
-        platform_hit_list = pygame.sprite.spritecollide(self, self.platforms, False)
+        platform_hit_list = self.platforms.collide(self.rect)
         for platform in platform_hit_list:
             if self.change_y > 0:
                 self.rect.bottom = platform.rect.top
@@ -70,9 +105,9 @@ class Player(pygame.sprite.Sprite):
                 self.change_y = 0
 
         if not self.on_ground:
-            self.set_player_image('sprites/player/player_fall.png')
+            self.set_frame(FRAME_FALL)
         elif self.change_x == 0 and self.acceleration == 0 and not self.attacking:
-            self.set_player_image('sprites/player/player.png')
+            self.set_frame(FRAME_IDLE)
 
         # Apply acceleration
         if self.acceleration != 0:
@@ -92,9 +127,10 @@ class Player(pygame.sprite.Sprite):
                 if self.change_x > 0:
                     self.change_x = 0
 
-    def set_player_image(self, image):
-        self.image = pygame.image.load(image).convert_alpha()
-        self.image = pygame.transform.scale(self.image, (PLAYER_WIDTH, PLAYER_HEIGHT))
+    def set_frame(self, frame_index):
+        if frame_index != self.frame_index:
+            self.frame_index = frame_index
+            self.image = self.frames[frame_index]
 
     def calc_grav(self):
         if self.change_y == 0:
@@ -115,12 +151,12 @@ class Player(pygame.sprite.Sprite):
     def attack(self):
         self.attacking = True
         if self.player_state:
-            self.set_player_image('sprites/player/player_attackB.png')
+            self.set_frame(FRAME_ATTACK_B)
         else:
             if self.last_direction_faced == 'right':
-                self.set_player_image('sprites/player/player_attackA_right.png')
+                self.set_frame(FRAME_ATTACK_A_RIGHT)
             else:
-                self.set_player_image('sprites/player/player_attackA_left.png')
+                self.set_frame(FRAME_ATTACK_A_LEFT)
         pygame.time.set_timer(pygame.USEREVENT + 1, 100)  # Custom event for ending attack animation
 
     def go_left(self):
@@ -141,7 +177,7 @@ class Player(pygame.sprite.Sprite):
             self.change_x += ACCELERATION / 2  # Smoother deceleration
             if self.change_x > 0:
                 self.change_x = 0
-        self.set_player_image('sprites/player/player.png')
+        self.set_frame(FRAME_IDLE)
 
     def switch_player_state(self):
         self.player_state = not self.player_state
@@ -0,0 +1,173 @@
+"""Per-phase frame profiler.
+
+Wrap each part of a frame in `with profiler.phase('name'):` between
+begin_frame() and end_frame(). Timings go into a ring buffer that feeds the
+on-screen overlay (rolling averages and a frame time graph) and can be
+exported as Chrome trace-event JSON (open in chrome://tracing or Perfetto).
+
+Set ENABLED to False to make phase() return a shared no-op context.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import pygame
+from text_cache import render_text
+
+ENABLED = True
+FRAME_HISTORY = 240  # Frames kept for the overlay averages and graph
+TRACE_EVENT_LIMIT = 50000  # Phase events kept for trace export
+OVERLAY_REFRESH_FRAMES = 30  # Re-render the overlay text this often
+OVERLAY_WIDTH = 260
+GRAPH_HEIGHT = 60
+GRAPH_MAX_MS = 50  # Frame time at the top of the graph
+TARGET_FRAME_MS = 1000 / 60  # Drawn as a reference line on the graph
+TRACE_FILE = 'profile_trace.json'
+
+
+class NullPhase:
+    """Context returned by phase() when profiling is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_PHASE = NullPhase()
+
+
+class Phase:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns() - self.start)
+        return False
+
+
+class Profiler:
+    """Times named phases of each frame into a ring buffer of recent frames."""
+
+    def __init__(self, history=FRAME_HISTORY):
+        self.frames = deque(maxlen=history)  # (frame ns, {phase: ns}) per finished frame
+        self.events = deque(maxlen=TRACE_EVENT_LIMIT)  # (name, start ns, duration ns)
+        self.current = {}
+        self.frame_start = None
+        self.overlay_visible = False
+        self.overlay_lines = []
+        self.frames_since_refresh = OVERLAY_REFRESH_FRAMES
+        self.thread_id = threading.get_ident()
+
+    def phase(self, name):
+        if not ENABLED:
+            return NULL_PHASE
+        return Phase(self, name)
+
+    def record(self, name, start, duration):
+        # Phases that run more than once a frame (e.g. per simulation tick) add up
+        self.current[name] = self.current.get(name, 0) + duration
+        self.events.append((name, start, duration))
+
+    def begin_frame(self):
+        if not ENABLED:
+            return
+        self.frame_start = time.perf_counter_ns()
+        self.current = {}
+
+    def end_frame(self):
+        if not ENABLED or self.frame_start is None:
+            return
+        end = time.perf_counter_ns()
+        self.frames.append((end - self.frame_start, self.current))
+        self.events.append(('frame', self.frame_start, end - self.frame_start))
+        self.frame_start = None
+        self.frames_since_refresh += 1
+
+    def averages(self):
+        """Return the mean frame time and the mean time of each phase, in milliseconds."""
+        if not self.frames:
+            return 0, {}
+        totals = {}
+        frame_total = 0
+        for frame_ns, phases in self.frames:
+            frame_total += frame_ns
+            for name, duration in phases.items():
+                totals[name] = totals.get(name, 0) + duration
+        count = len(self.frames)
+        return frame_total / count / 1e6, {name: total / count / 1e6 for name, total in totals.items()}
+
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+        self.frames_since_refresh = OVERLAY_REFRESH_FRAMES
+
+    def draw_overlay(self, surface, stats=()):
+        """Draw the overlay in the top right corner and return the rect it covers, or None.
+
+        stats is an optional sequence of (label, value) pairs shown under the phase times.
+        """
+        if not ENABLED or not self.overlay_visible:
+            return None
+
+        if self.frames_since_refresh >= OVERLAY_REFRESH_FRAMES:
+            frame_ms, phases = self.averages()
+            fps = 1000 / frame_ms if frame_ms else 0
+            lines = [f'frame {frame_ms:6.2f} ms  {fps:5.0f} fps']
+            lines += [f'{name:<12}{ms:6.2f} ms' for name, ms in sorted(phases.items(), key=lambda item: -item[1])]
+            lines += [f'{label:<12}{value}' for label, value in stats]
+            self.overlay_lines = lines
+            self.frames_since_refresh = 0
+
+        line_height = 18
+        rect = pygame.Rect(0, 0, OVERLAY_WIDTH, len(self.overlay_lines) * line_height + GRAPH_HEIGHT + 12)
+        rect.topright = (surface.get_width() - 10, 10)
+        panel = pygame.Surface(rect.size, pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        for i, line in enumerate(self.overlay_lines):
+            panel.blit(render_text(line, 20, (255, 255, 255)), (6, 4 + i * line_height))
+
+        # Frame time graph, newest frame on the right
+        graph_top = rect.height - GRAPH_HEIGHT - 4
+        bar_width = OVERLAY_WIDTH / self.frames.maxlen
+        for i, (frame_ns, _) in enumerate(self.frames):
+            ms = frame_ns / 1e6
+            height = min(GRAPH_HEIGHT, int(ms * GRAPH_HEIGHT / GRAPH_MAX_MS))
+            color = (80, 220, 80) if ms <= TARGET_FRAME_MS else (230, 80, 60)
+            x = int(i * bar_width)
+            pygame.draw.line(panel, color, (x, graph_top + GRAPH_HEIGHT), (x, graph_top + GRAPH_HEIGHT - height))
+        target_y = graph_top + GRAPH_HEIGHT - int(TARGET_FRAME_MS * GRAPH_HEIGHT / GRAPH_MAX_MS)
+        pygame.draw.line(panel, (255, 255, 0), (0, target_y), (OVERLAY_WIDTH, target_y))
+
+        surface.blit(panel, rect)
+        return rect
+
+    def export_chrome_trace(self, filename=TRACE_FILE):
+        """Write the recorded phases as Chrome trace-event JSON."""
+        pid = os.getpid()
+        events = [
+            {'name': name, 'cat': 'frame' if name == 'frame' else 'phase', 'ph': 'X',
+             'ts': start / 1000, 'dur': duration / 1000, 'pid': pid, 'tid': self.thread_id}
+            for name, start, duration in self.events
+        ]
+        with open(filename, 'w') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+        return filename
+
+    def clear(self):
+        self.frames.clear()
+        self.events.clear()
+        self.current = {}
+        self.frame_start = None
+
+
+# Shared instance used by the game loop
+profiler = Profiler()
@@ -0,0 +1,302 @@
+import pygame
+from spatial_grid import SpatialGrid
+
+# Decorations at or beyond these z indices scroll with parallax
+FOREGROUND_Z = 10
+BACKGROUND_Z = -10
+FOREGROUND_PARALLAX = -0.1  # Foreground moves
+BACKGROUND_PARALLAX = 0.1  # Background moves faster
+
+# Size of the pre-rendered tiles static content is baked into
+CHUNK_SIZE = 256
+
+# Opt in to pushing only the changed parts of each frame to the display; read every frame
+DIRTY_RECT_RENDERING = False
+
+
+class ScreenPresenter:
+    """Pushes finished frames to the display, either whole or as a list of changed rects.
+
+    Follows DIRTY_RECT_RENDERING unless dirty_rects is given or assigned.
+    """
+
+    def __init__(self, dirty_rects=None):
+        self.dirty_rects_setting = dirty_rects
+        self.rects = []
+        self.needs_full_update = True
+        self.presented_dirty_rects = None
+
+    @property
+    def dirty_rects(self):
+        if self.dirty_rects_setting is None:
+            return DIRTY_RECT_RENDERING
+        return self.dirty_rects_setting
+
+    @dirty_rects.setter
+    def dirty_rects(self, enabled):
+        self.dirty_rects_setting = enabled
+
+    def invalidate(self):
+        """Make the next present() push the whole frame, e.g. after switching screens."""
+        self.needs_full_update = True
+
+    def mark(self, *rects):
+        """Record screen regions that changed since the last present()."""
+        if self.dirty_rects:
+            self.rects.extend(rects)
+
+    def present(self):
+        dirty_rects = self.dirty_rects
+        # Rects weren't collected while the mode was off, so push everything once it turns on
+        if dirty_rects != self.presented_dirty_rects:
+            self.needs_full_update = True
+            self.presented_dirty_rects = dirty_rects
+        if not dirty_rects or self.needs_full_update:
+            pygame.display.flip()
+        elif self.rects:
+            pygame.display.update(self.rects)
+        self.rects.clear()
+        self.needs_full_update = False
+
+
+# Shared by every screen loop in the game
+presenter = ScreenPresenter()
+
+
+class ZOrderedGroup(pygame.sprite.LayeredUpdates):
+    """Sprite group kept sorted by z_index as sprites are added, removed or moved between layers."""
+
+    def add_internal(self, sprite, layer=None):
+        if layer is None:
+            layer = getattr(sprite, 'z_index', 0)
+        super().add_internal(sprite, layer)
+
+    def set_z_index(self, sprite, z_index):
+        sprite.z_index = z_index
+        self.change_layer(sprite, z_index)
+
+    def ordered(self):
+        """Return the live back-to-front sprite list without copying it; do not modify it while iterating."""
+        return self._spritelist
+
+
+def composite(sprites, area):
+    """Render sprites (in draw order) into a new surface covering area, in room coordinates.
+
+    The result holds premultiplied alpha so translucent edges survive being composited
+    twice; blit it with special_flags=pygame.BLEND_PREMULTIPLIED.
+    """
+    surface = pygame.Surface(area.size, pygame.SRCALPHA)
+    for sprite in sprites:
+        image = sprite.image
+        if not image.get_flags() & pygame.SRCALPHA:
+            image = image.convert_alpha()
+        surface.blit(image.premul_alpha(), (sprite.rect.x - area.x, sprite.rect.y - area.y),
+                     special_flags=pygame.BLEND_PREMULTIPLIED)
+    return surface
+
+
+def parallax_factor(z_index):
+    """Return how far a decoration at z_index scrolls against the camera, or None if it doesn't."""
+    if z_index >= FOREGROUND_Z:
+        return FOREGROUND_PARALLAX
+    if z_index <= BACKGROUND_Z:
+        return BACKGROUND_PARALLAX
+    return None
+
+
+class ParallaxBand(pygame.sprite.Sprite):
+    """Every parallax decoration at one z_index, pre-composited into a single strip.
+
+    The band goes into the z-ordered render group in place of its decorations and is
+    drawn like any other sprite; scroll() moves it for the current camera position.
+    """
+    # The strip holds premultiplied alpha, see composite()
+    blend_flags = pygame.BLEND_PREMULTIPLIED
+
+    def __init__(self, z_index):
+        super().__init__()
+        self.z_index = z_index
+        self.factor = parallax_factor(z_index)
+        self.decorations = []
+        self.image = None
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.origin_x = 0
+
+    def add_decoration(self, decoration):
+        self.decorations.append(decoration)
+        self.image = None
+
+    def bake(self):
+        area = self.decorations[0].rect.unionall([decoration.rect for decoration in self.decorations])
+        self.image = composite(self.decorations, area)
+        self.rect = area
+        self.origin_x = area.x
+
+    def scroll(self, camera):
+        if self.image is None:
+            self.bake()
+        self.rect.x = self.origin_x - camera.camera.x * self.factor
+
+
+class ParallaxLayers:
+    """The parallax bands of a room, grouped by z_index when the room loads."""
+
+    def __init__(self):
+        self.bands = {}
+
+    def accepts(self, decoration):
+        return parallax_factor(decoration.z_index) is not None
+
+    def add(self, decoration):
+        band = self.bands.get(decoration.z_index)
+        if band is None:
+            band = self.bands[decoration.z_index] = ParallaxBand(decoration.z_index)
+        band.add_decoration(decoration)
+
+    def bake(self):
+        for band in self.bands.values():
+            band.bake()
+
+    def scroll(self, camera):
+        """Position every band for this frame's camera; one rect update per band."""
+        for band in self.bands.values():
+            band.scroll(camera)
+
+
+class StaticChunkGroup(pygame.sprite.Group):
+    """Sprites that never move, pre-rendered into CHUNK_SIZE tiles covering the room.
+
+    The chunks are drawn where layer_marker sits in the z-ordered render group.
+    Adding or removing a sprite (including a platform breaking through sprite.kill())
+    marks the chunks it overlaps for rebaking. Call bake_dirty() once the room is
+    built so drawing only ever rebakes the few visible chunks changed during play.
+    """
+
+    def __init__(self, *sprites, chunk_size=CHUNK_SIZE):
+        self.layer_marker = pygame.sprite.Sprite()
+        self.layer_marker.z_index = 0
+        self.chunk_size = chunk_size
+        self.grid = SpatialGrid(chunk_size)
+        self.chunks = {}
+        self.dirty = set()
+        self.rebaked = 0  # Chunks rebaked by the last draw_chunks()
+        # Sprite -> the order it was first added in, so a sprite taken out and put back
+        # (e.g. when a room is reset) is drawn at its original depth
+        self.order = {}
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.order.setdefault(sprite, len(self.order))
+        self.grid.insert(sprite, sprite.rect)
+        self.dirty.update(self.grid.item_cells[sprite])
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.dirty.update(self.grid.item_cells.get(sprite, ()))
+        self.grid.remove(sprite)
+
+    def bake(self, key):
+        sprites = self.grid.cells.get(key)
+        if not sprites:
+            self.chunks.pop(key, None)
+            return
+        size = self.chunk_size
+        sprites = sorted(sprites, key=self.order.__getitem__)
+        self.chunks[key] = composite(sprites, pygame.Rect(key[0] * size, key[1] * size, size, size))
+
+    def bake_dirty(self):
+        """Bake every chunk waiting to be baked, e.g. when a room loads."""
+        for key in self.dirty:
+            self.bake(key)
+        self.dirty.clear()
+
+    def draw_chunks(self, screen, camera):
+        """Blit the chunks overlapping the camera view, rebaking any that changed; returns the number drawn."""
+        size = self.chunk_size
+        offset_x, offset_y = camera.camera.topleft
+        drawn = 0
+        self.rebaked = 0
+        for key in self.grid.cells_for(camera.visible_rect()):
+            # Chunks off screen stay dirty until they scroll into view
+            if key in self.dirty:
+                self.bake(key)
+                self.dirty.discard(key)
+                self.rebaked += 1
+            chunk = self.chunks.get(key)
+            if chunk:
+                screen.blit(chunk, (key[0] * size + offset_x, key[1] * size + offset_y),
+                            special_flags=pygame.BLEND_PREMULTIPLIED)
+                drawn += 1
+        return drawn
+
+
+class Renderer:
+    """Draws the room's sprites through the camera, skipping anything off screen."""
+
+    def __init__(self, screen):
+        self.screen = screen
+        # Sprites and static chunks drawn, and sprites culled, during the last frame
+        self.drawn = 0
+        self.culled = 0
+        self.chunks_drawn = 0
+        # Screen rects drawn last frame, for dirty rect rendering
+        self.last_rects = []
+        self.last_offset = None
+        self.last_static_sprites = None
+
+    def draw_world(self, sprites, static_sprites, camera, particles):
+        """Blit sprites (already in z order) with the static chunks and the particles at z_index 0."""
+        screen = self.screen
+        offset_x, offset_y = camera.camera.topleft
+        view = camera.visible_rect()
+        view_left, view_top, view_right, view_bottom = view.left, view.top, view.right, view.bottom
+        drawn = culled = 0
+        particles_drawn = False
+        chunk_marker = static_sprites.layer_marker
+        track_rects = presenter.dirty_rects
+        rects = []
+        rebaked = False
+
+        for sprite in sprites:
+            if sprite is chunk_marker:
+                self.chunks_drawn = static_sprites.draw_chunks(screen, camera)
+                rebaked = static_sprites.rebaked > 0
+                continue
+            z_index = getattr(sprite, 'z_index', 0)
+            if not particles_drawn and z_index > 0:
+                self.draw_particles(particles, (offset_x, offset_y), rects if track_rects else None)
+                particles_drawn = True
+
+            rect = sprite.rect
+            if rect.x >= view_right or rect.right <= view_left or rect.y >= view_bottom or rect.bottom <= view_top:
+                culled += 1
+                continue
+            screen.blit(sprite.image, (rect.x + offset_x, rect.y + offset_y), special_flags=getattr(sprite, 'blend_flags', 0))
+            drawn += 1
+            if track_rects:
+                rects.append((rect.x + offset_x, rect.y + offset_y, rect.width, rect.height))
+
+        if not particles_drawn:
+            self.draw_particles(particles, (offset_x, offset_y), rects if track_rects else None)
+        self.drawn = drawn
+        self.culled = culled
+
+        if track_rects:
+            # A scrolling camera, a different room or a rebaked chunk changes the whole
+            # view, otherwise only the areas sprites left and moved into need presenting
+            if (offset_x, offset_y) != self.last_offset or static_sprites is not self.last_static_sprites or rebaked:
+                presenter.invalidate()
+            else:
+                presenter.mark(*self.last_rects, *rects)
+            self.last_rects = rects
+            self.last_offset = (offset_x, offset_y)
+            self.last_static_sprites = static_sprites
+
+    def draw_particles(self, particles, offset, rects):
+        particles.draw(self.screen, offset)
+        if rects is not None:
+            bounds = particles.bounds(offset)
+            if bounds:
+                rects.append(bounds)
@@ -0,0 +1,108 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+
+def increment_room(room_name):
+    match = re.match(r'room(\d+)([A-Za-z])', room_name)
+    if match:
+        room_number = int(match.group(1))
+        room_letter = match.group(2)
+        return f'room{room_number + 1}{room_letter}'
+    return room_name
+
+
+def swap_room_letter(room_name):
+    match = re.match(r'room(\d+)([A-Za-z])', room_name)
+    if match:
+        return f'room{match.group(1)}B' if match.group(2) == 'A' else f'room{match.group(1)}A'
+    return room_name
+
+
+class Room:
+    """The sprite groups that make up one loaded room.
+
+    The platforms and targets it was built with are remembered so that reset()
+    can undo what the player changed without building the room again.
+    """
+
+    def __init__(self, name, all_sprites, static_sprites, parallax, platforms, goal, spawn_point, targets):
+        self.name = name
+        self.all_sprites = all_sprites
+        self.static_sprites = static_sprites
+        self.parallax = parallax
+        self.platforms = platforms
+        self.goal = goal
+        self.spawn_point = spawn_point
+        self.targets = targets
+        self.built_platforms = platforms.sprites()
+        self.built_targets = targets.sprites()
+
+    def reset(self):
+        """Put back broken platforms and hit targets, removing the platforms the targets became."""
+        built = set(self.built_platforms)
+        for platform in self.platforms.sprites():
+            if platform not in built:
+                platform.kill()
+        for platform in self.built_platforms:
+            if not platform.alive():
+                self.platforms.add(platform)
+                self.static_sprites.add(platform)
+        for target in self.built_targets:
+            if not target.alive():
+                self.targets.add(target)
+                self.all_sprites.add(target)
+
+
+class RoomManager:
+    """Keeps both variants of the current room resident and builds the next room in the background.
+
+    Rooms are built by loader(room_name) on a single worker thread and must come back
+    ready to draw, with all baking done there rather than on the first frame. Every
+    room is entered fresh: swapping variants resets the resident room in place
+    instead of rebuilding it, so a swap never waits on the loader.
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='room-loader')
+        self.rooms = {}
+        self.current = None
+
+    def prefetch(self, room_name):
+        if room_name not in self.rooms:
+            self.rooms[room_name] = self.executor.submit(self.loader, room_name)
+
+    def get(self, room_name):
+        """Return the built room, waiting for it only if it hasn't finished loading."""
+        self.prefetch(room_name)
+        return self.rooms[room_name].result()
+
+    def enter(self, room_name):
+        """Move to a room once both its variants are built, so swapping between them never waits."""
+        room = self.get(room_name)
+        self.get(swap_room_letter(room_name))
+        self.current = room
+
+        # Keep this room's other variant live and start on the next pair of rooms
+        next_room = increment_room(room_name)
+        wanted = [room_name, swap_room_letter(room_name), next_room, swap_room_letter(next_room)]
+        for name in wanted:
+            self.prefetch(name)
+        for name in list(self.rooms):
+            if name not in wanted:
+                self.rooms.pop(name).cancel()
+        return room
+
+    def switch_variant(self):
+        """Swap to the other letter of the current room."""
+        room = self.get(swap_room_letter(self.current.name))
+        room.reset()
+        self.current = room
+        return room
+
+    def advance(self):
+        """Move on to the next numbered room."""
+        return self.enter(increment_room(self.current.name))
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,77 @@
+import pygame
+
+# Size of one grid cell in pixels
+GRID_CELL_SIZE = 128
+
+
+class SpatialGrid:
+    """Uniform grid that buckets items by the cells their rect overlaps."""
+
+    def __init__(self, cell_size=GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.item_cells = {}
+
+    def cells_for(self, rect):
+        """Return the (column, row) keys of every cell the rect overlaps."""
+        size = self.cell_size
+        left = rect.left // size
+        top = rect.top // size
+        right = max(rect.left, rect.right - 1) // size
+        bottom = max(rect.top, rect.bottom - 1) // size
+        return [(cx, cy) for cx in range(left, right + 1) for cy in range(top, bottom + 1)]
+
+    def insert(self, item, rect):
+        keys = self.cells_for(rect)
+        for key in keys:
+            # Dicts keep insertion order, so query results are deterministic
+            self.cells.setdefault(key, {})[item] = None
+        self.item_cells[item] = keys
+
+    def remove(self, item):
+        for key in self.item_cells.pop(item, ()):
+            cell = self.cells[key]
+            del cell[item]
+            if not cell:
+                del self.cells[key]
+
+    def move(self, item, rect):
+        self.remove(item)
+        self.insert(item, rect)
+
+    def query(self, rect):
+        """Return every item in the cells overlapped by rect (a superset of the actual hits)."""
+        found = {}
+        for key in self.cells_for(rect):
+            cell = self.cells.get(key)
+            if cell:
+                found.update(cell)
+        return list(found)
+
+    def clear(self):
+        self.cells.clear()
+        self.item_cells.clear()
+
+
+class SpatialGroup(pygame.sprite.Group):
+    """Sprite group that keeps a SpatialGrid of its sprites' rects up to date."""
+
+    def __init__(self, *sprites, cell_size=GRID_CELL_SIZE):
+        self.grid = SpatialGrid(cell_size)
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.grid.insert(sprite, sprite.rect)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.grid.remove(sprite)
+
+    def reindex(self, sprite):
+        """Call after moving or resizing a sprite that belongs to this group."""
+        self.grid.move(sprite, sprite.rect)
+
+    def collide(self, rect):
+        """Return the sprites whose rect overlaps the given rect."""
+        return [sprite for sprite in self.grid.query(rect) if rect.colliderect(sprite.rect)]
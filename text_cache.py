@@ -0,0 +1,72 @@
+import pygame
+from collections import OrderedDict
+
+# Maximum number of rendered strings kept alive at once
+MAX_CACHED_TEXT = 256
+DIGIT_CHARACTERS = '-0123456789'
+
+
+class TextCache:
+    """Caches fonts and rendered text so glyphs are rasterized once, not every frame."""
+
+    def __init__(self, max_size=MAX_CACHED_TEXT):
+        self.max_size = max_size
+        self.fonts = {}
+        self.texts = OrderedDict()
+        self.digits = {}
+
+    def get_font(self, size, font_name=None):
+        key = (font_name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(font_name, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, size, color, antialias=True, font_name=None):
+        key = (font_name, size, text, tuple(color), antialias)
+        surface = self.texts.get(key)
+        if surface is not None:
+            self.texts.move_to_end(key)
+            return surface
+
+        surface = self.get_font(size, font_name).render(text, antialias, color)
+        self.texts[key] = surface
+        while len(self.texts) > self.max_size:
+            self.texts.popitem(last=False)
+        return surface
+
+    def get_digits(self, size, color, antialias=True, font_name=None):
+        """Return a glyph surface for each of '-' and '0'-'9'."""
+        key = (font_name, size, tuple(color), antialias)
+        glyphs = self.digits.get(key)
+        if glyphs is None:
+            font = self.get_font(size, font_name)
+            glyphs = {char: font.render(char, antialias, color) for char in DIGIT_CHARACTERS}
+            self.digits[key] = glyphs
+        return glyphs
+
+    def draw_number(self, surface, position, value, size, color, prefix='', antialias=True, font_name=None):
+        """Blit prefix followed by an integer, built from cached digit glyphs so changing numbers never fill the cache."""
+        x, y = position
+        if prefix:
+            prefix_surface = self.render(prefix, size, color, antialias, font_name)
+            surface.blit(prefix_surface, (x, y))
+            x += prefix_surface.get_width()
+        glyphs = self.get_digits(size, color, antialias, font_name)
+        for char in str(int(value)):
+            glyph = glyphs[char]
+            surface.blit(glyph, (x, y))
+            x += glyph.get_width()
+
+
+# Shared instance used by every screen
+text_cache = TextCache()
+
+
+def render_text(text, size, color, antialias=True, font_name=None):
+    return text_cache.render(text, size, color, antialias, font_name)
+
+
+def draw_number(surface, position, value, size, color, prefix='', antialias=True, font_name=None):
+    text_cache.draw_number(surface, position, value, size, color, prefix, antialias, font_name)
@@ -0,0 +1,66 @@
+from contextlib import contextmanager
+
+TICK_RATE = 60  # Simulation steps per second; player and particle constants are tuned per step
+MAX_TICKS_PER_FRAME = 5  # Catch-up limit so a long stall doesn't snowball into longer frames
+RENDER_CAPS = (30, 60, 120, 0)  # Selectable render frame rate caps, 0 is uncapped
+
+
+class FixedTimestep:
+    """Accumulates real frame time and hands it out as whole fixed-length simulation ticks."""
+
+    def __init__(self, tick_rate=TICK_RATE, max_ticks=MAX_TICKS_PER_FRAME):
+        self.tick_ms = 1000 / tick_rate
+        self.max_ticks = max_ticks
+        self.accumulator = 0
+
+    def advance(self, frame_ms):
+        """Add frame_ms of real time and return how many ticks to simulate this frame."""
+        self.accumulator += frame_ms
+        ticks = int(self.accumulator // self.tick_ms)
+        if ticks > self.max_ticks:
+            # Too far behind to catch up; drop the backlog and run slower for a frame
+            ticks = self.max_ticks
+            self.accumulator = ticks * self.tick_ms
+        self.accumulator -= ticks * self.tick_ms
+        return ticks
+
+    @property
+    def alpha(self):
+        """How far between the last two ticks the current render falls, from 0 to 1."""
+        return self.accumulator / self.tick_ms
+
+    def reset(self):
+        self.accumulator = 0
+
+
+class Interpolator:
+    """Remembers where moving sprites were before a tick so renders can blend between ticks."""
+
+    def __init__(self):
+        self.previous = {}
+
+    def snapshot(self, sprites):
+        self.previous = {sprite: sprite.rect.topleft for sprite in sprites}
+
+    def place(self, sprite):
+        """Start a sprite that just appeared (e.g. a recycled projectile) where it is, not where it last was."""
+        self.previous[sprite] = sprite.rect.topleft
+
+    @contextmanager
+    def apply(self, sprites, alpha):
+        """Temporarily move sprites to their interpolated positions for drawing."""
+        moved = []
+        for sprite in sprites:
+            previous = self.previous.get(sprite)
+            if previous is None:
+                continue
+            current = sprite.rect.topleft
+            if previous != current:
+                sprite.rect.topleft = (round(previous[0] + (current[0] - previous[0]) * alpha),
+                                       round(previous[1] + (current[1] - previous[1]) * alpha))
+                moved.append((sprite, current))
+        try:
+            yield
+        finally:
+            for sprite, current in moved:
+                sprite.rect.topleft = current